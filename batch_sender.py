@@ -0,0 +1,85 @@
+"""
+Group-commit batch sender for outbound email.
+
+Concurrent callers each used to pay a full SMTP round-trip per email.
+The BatchSender accumulates messages from all callers for up to a few
+milliseconds (or until a batch fills), then dispatches the whole batch
+over a single pooled SMTP connection. Two workers run so one batch's
+network wait overlaps the next batch's collection.
+"""
+import logging
+import queue
+import threading
+from concurrent.futures import Future
+from typing import List, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+
+class BatchSender:
+    """Accumulates outbound emails and flushes them in batches"""
+
+    MAX_BATCH = 64      # flush as soon as this many messages are queued
+    MAX_WAIT = 0.01     # seconds to wait for more messages before flushing
+    MAX_CONCURRENT_FLUSHES = 2
+
+    def __init__(self, email_service):
+        self._service = email_service
+        self._queue: "queue.Queue" = queue.Queue()
+        self._workers = []
+        for i in range(self.MAX_CONCURRENT_FLUSHES):
+            worker = threading.Thread(
+                target=self._worker_loop, daemon=True, name=f"email-batch-{i}"
+            )
+            worker.start()
+            self._workers.append(worker)
+
+    def submit(
+        self,
+        to_email: str,
+        subject: str,
+        body_html: Union[str, bytes],
+        attachments: Optional[List[str]] = None
+    ) -> Future:
+        """
+        Queue an email for batched delivery.
+
+        Returns:
+            Future resolving to True/False once the email is sent
+        """
+        future: Future = Future()
+        self._queue.put((future, to_email, subject, body_html, attachments))
+        return future
+
+    def _worker_loop(self):
+        while True:
+            # Block for the first message, then drain whatever arrives
+            # within MAX_WAIT so concurrent callers share one session
+            batch = [self._queue.get()]
+            while len(batch) < self.MAX_BATCH:
+                try:
+                    batch.append(self._queue.get(timeout=self.MAX_WAIT))
+                except queue.Empty:
+                    break
+            self._flush(batch)
+
+    def _flush(self, batch):
+        """Send a batch of messages over one pooled SMTP connection"""
+        try:
+            with self._service._pool.acquire() as server:
+                for future, to_email, subject, body_html, attachments in batch:
+                    try:
+                        msg = self._service._build_message(
+                            to_email, subject, body_html, attachments
+                        )
+                        self._service._deliver(server, msg)
+                        logger.info("Email sent successfully to %s", to_email)
+                        future.set_result(True)
+                    except Exception as e:
+                        logger.warning("Failed to send email to %s: %s", to_email, e)
+                        future.set_result(False)
+        except Exception:
+            logger.exception("Failed to open SMTP connection for batch")
+            for future, *_ in batch:
+                if not future.done():
+                    future.set_result(False)
@@ -4,12 +4,289 @@ Provides real-time brand analysis, content generation, and strategic insights
 """
 
 import os
-import json
-from typing import Dict, List, Optional
+import re
+import base64
+import hashlib
+import orjson
+import asyncio
+import threading
+from pathlib import Path
+from typing import AsyncIterator, Dict, List, Literal, Optional
 from datetime import datetime
-from openai import OpenAI
+from pydantic import BaseModel
 from config import settings
 
+# Cap concurrent OpenAI calls across all sessions to stay under rate limits
+OPENAI_CONCURRENCY_LIMIT = 20
+_openai_semaphore = asyncio.Semaphore(OPENAI_CONCURRENCY_LIMIT)
+
+# One OpenAI client (and so one TLS connection pool) shared by every
+# assistant instance - per-session clients re-did TLS handshakes and
+# capped concurrency at the httpx defaults. Created lazily so importing
+# this module (health checks, action classification, exports) doesn't
+# pay for loading the several-hundred-module OpenAI SDK on cold start.
+_shared_openai_client = None
+
+
+def _get_shared_client():
+    """Return the shared AsyncOpenAI client, creating it on first use."""
+    global _shared_openai_client
+
+    if _shared_openai_client is None:
+        import httpx
+        from openai import AsyncOpenAI
+
+        _shared_openai_client = AsyncOpenAI(
+            api_key=settings.openai_api_key,
+            http_client=httpx.AsyncClient(
+                limits=httpx.Limits(max_connections=200, max_keepalive_connections=50),
+                timeout=httpx.Timeout(60.0, connect=5.0)
+            )
+        )
+
+    return _shared_openai_client
+
+
+async def close_shared_client():
+    """Close the shared OpenAI HTTP client. Call on application shutdown."""
+    if _shared_openai_client is not None:
+        await _shared_openai_client.close()
+
+
+# Semantic-cache plumbing shared by every assistant: one embedding model
+# and one cache handle per brand. redisvl's default vectorizer is a full
+# sentence-transformers model load (seconds, ~100MB), so nothing here is
+# built per instance - construction happens lazily inside the
+# worker-thread cache calls and never touches the event loop.
+_semantic_caches: Dict[str, object] = {}
+_semantic_cache_lock = threading.Lock()
+_semantic_vectorizer = None
+_semantic_cache_down = False
+
+
+def _get_semantic_cache(brand_handle: str):
+    """Return the shared per-brand SemanticCache, or None if unavailable.
+
+    Only call from a worker thread - the first call loads the embedding
+    model. Degrades to None (no caching) if Redis / redisvl is
+    unavailable, and remembers the failure so later calls are free.
+    """
+    global _semantic_vectorizer, _semantic_cache_down
+
+    if _semantic_cache_down:
+        return None
+
+    with _semantic_cache_lock:
+        cache = _semantic_caches.get(brand_handle)
+        if cache is None:
+            try:
+                # redisvl 0.3.x ships SemanticCache under
+                # extensions.llmcache (the cache.llm path only exists in
+                # later releases)
+                from redisvl.extensions.llmcache import SemanticCache
+
+                if _semantic_vectorizer is None:
+                    from redisvl.utils.vectorize import HFTextVectorizer
+                    _semantic_vectorizer = HFTextVectorizer()
+
+                cache = SemanticCache(
+                    name=f"pixaro:{brand_handle}",
+                    redis_url=settings.redis_url,
+                    distance_threshold=0.1,
+                    ttl=3600,
+                    vectorizer=_semantic_vectorizer
+                )
+            except Exception as e:
+                print(f"Warning: semantic cache unavailable: {e}")
+                _semantic_cache_down = True
+                return None
+            _semantic_caches[brand_handle] = cache
+        return cache
+
+# Number of recent conversation turns sent to the model verbatim; older
+# turns are condensed into a summary so prompt size stays bounded
+HISTORY_WINDOW = 4
+
+# Re-run the condenser only once this many uncondensed old messages pile up
+CONDENSE_EVERY = 4
+
+# Action detection patterns, compiled once at import. Order matters:
+# image generation is checked first, most generic actions last.
+_ACTION_PATTERNS = [
+    (re.compile(
+        r"(create|generate|make)\s+(an?\s+)?(image|photo|visual|post\s+photo|post\s+image)"
+        r"|design\s+(a\s+)?post"
+        r"|(image|photo|picture|graphic|design)\s+(of|about)"
+    ), "generate_image"),
+    (re.compile(r"(generate|send|create|email)\s+report"), "generate_report"),
+    (re.compile(r"generate\s+(post|content)|create\s+caption|write\s+post"), "generate_content"),
+    (re.compile(r"competitor|competition|rival"), "competitor_analysis"),
+    (re.compile(r"predict|forecast|what\s+if|scenario"), "predictive_analysis"),
+    (re.compile(r"persona|audience\s+segment|who\s+is"), "audience_insights"),
+    (re.compile(r"campaign|strategy|plan"), "campaign_creation"),
+]
+
+# Optional Hyperscan fast path for high-QPS deployments: one JIT'd DFA
+# pass matches every trigger pattern at once. Falls back to the compiled
+# re patterns above when the extension isn't installed.
+try:
+    import hyperscan
+
+    _hs_db = hyperscan.Database()
+    _hs_db.compile(
+        expressions=[pattern.pattern.encode() for pattern, _ in _ACTION_PATTERNS],
+        ids=list(range(len(_ACTION_PATTERNS))),
+        flags=[hyperscan.HS_FLAG_CASELESS] * len(_ACTION_PATTERNS)
+    )
+except Exception:
+    _hs_db = None
+
+
+# Shared prompt store: all sessions for the same brand reuse one str
+# object instead of each holding a byte-identical ~2KB copy. Keyed by
+# content hash; a plain dict because str cannot be weakly referenced.
+_prompt_intern: Dict[bytes, str] = {}
+
+
+def _intern_prompt(prompt: str) -> str:
+    """Return a shared str object for this prompt content."""
+    key = hashlib.blake2b(prompt.encode(), digest_size=16).digest()
+    return _prompt_intern.setdefault(key, prompt)
+
+
+# Helper prompt templates, defined once at import and filled per call -
+# the big literals aren't rebuilt by the f-string machinery on every call
+_IG_POSTS_TMPL = """Create {count} Instagram post captions for {handle} about: {topic}
+
+For each post provide an engaging caption (150-200 characters), 5-8 relevant
+hashtags, the best posting time, and a content type. Make sure captions match
+the brand voice and tone. Include call-to-actions."""
+
+_PREDICT_TMPL = """Analyze this content idea for {platform}: "{content_idea}"
+
+Provide predictions for:
+1. Engagement Rate (estimate %)
+2. Expected Reach (Low/Medium/High)
+3. Audience Sentiment (Positive/Neutral/Negative)
+4. Viral Potential Score (1-10)
+5. Best Day/Time to Post
+6. Recommendations to improve engagement
+
+Base predictions on brand DNA and typical audience behavior for {handle}."""
+
+_CAMPAIGN_TMPL = """Create a complete marketing campaign for {handle}:
+
+Goal: {goal}
+Duration: {duration}
+Budget: {budget}
+
+Provide:
+1. Campaign Overview (objectives, KPIs)
+2. Target Audience Segments
+3. Content Calendar (week-by-week breakdown)
+4. Channel Strategy (which platforms, why)
+5. Creative Concepts (3-5 content ideas)
+6. Budget Allocation
+7. Success Metrics
+8. Risk Mitigation
+
+Make it actionable and specific to the brand's DNA and audience."""
+
+_COMPETITOR_TMPL = """Analyze competitor: {competitor} for {handle}
+
+Provide:
+1. Content Strategy Analysis
+   - What are they posting?
+   - Posting frequency and timing
+   - Engagement patterns
+
+2. Strengths & Weaknesses
+   - What are they doing well?
+   - What are their gaps?
+
+3. Opportunities for {handle}
+   - Content gaps we can fill
+   - Underserved audience segments
+   - Better positioning angles
+
+4. Actionable Recommendations
+   - 3 things we should do differently
+   - 2 things we should learn from them
+   - 1 bold move to differentiate
+
+Be specific and actionable."""
+
+_PERSONA_TMPL = """Create detailed audience micro-persona {num} of 4 for {handle}:
+
+Provide:
+1. Name & Age (e.g., "Sarah, 28")
+2. Job Title & Industry
+3. Key Characteristics (3-4 traits)
+4. Pain Points (2-3 specific problems)
+5. Content Preferences (what they engage with)
+6. Best Way to Reach Them (channel + message type)
+7. Engagement Behavior (when/how they interact)
+
+Focus on a distinct audience segment for persona {num} (vary age, role,
+and motivation from the other personas). Make it realistic and actionable
+for targeted marketing."""
+
+_DAY_PLAN_TMPL = """Create the {day} entry of a 7-day content strategy for {handle}:
+
+Provide:
+1. Content Theme/Topic
+2. Platform (Instagram/LinkedIn/Twitter/etc.)
+3. Content Format (Reel/Carousel/Story/Post)
+4. Caption Template (with hashtags)
+5. Best Posting Time
+6. CTA (call-to-action)
+
+Pick a theme and format that suit {day} specifically, so the week as a
+whole has variety. Align with brand DNA and audience preferences."""
+
+
+class IGPost(BaseModel):
+    """Structured Instagram post returned by the model."""
+    caption: str
+    hashtags: List[str]
+    best_time: str
+    content_type: Literal["carousel", "reel", "static"]
+
+
+class IGPostBatch(BaseModel):
+    """Batch wrapper so one completion returns all requested posts."""
+    posts: List[IGPost]
+
+
+class Turn:
+    """
+    Single conversation turn.
+
+    __slots__ avoids a per-turn instance dict, cutting memory ~3-4x versus
+    the previous list-of-dicts history and making the per-turn scan in
+    message building attribute access instead of hashed dict lookups.
+    """
+
+    __slots__ = ("role", "content", "timestamp", "image_url")
+
+    def __init__(self, role: str, content: str, timestamp: str, image_url: Optional[str] = None):
+        self.role = role
+        self.content = content
+        self.timestamp = timestamp
+        self.image_url = image_url
+
+    def as_dict(self) -> Dict:
+        """Dict form for JSON serialization and API responses."""
+        turn = {
+            "role": self.role,
+            "content": self.content,
+            "timestamp": self.timestamp
+        }
+        if self.image_url:
+            turn["image_url"] = self.image_url
+        return turn
+
+
 class PixaroBrandAssistant:
     """
     Personal AI Brand Assistant that acts as a virtual marketing strategist.
@@ -23,20 +300,119 @@ class PixaroBrandAssistant:
     - Competitor trend alerts
     """
 
-    def __init__(self, brand_handle: str, brand_context: Optional[Dict] = None):
+    def __init__(
+        self,
+        brand_handle: str,
+        brand_context: Optional[Dict] = None,
+        model: str = "gpt-4o-mini",
+        max_tokens_short: int = 800,
+        max_tokens_long: int = 1800
+    ):
         """
         Initialize the AI assistant for a specific brand.
 
         Args:
             brand_handle: Social media handle or brand name
             brand_context: Pre-loaded brand DNA data (optional)
+            model: Chat model for all completions (latency/cost dial)
+            max_tokens_short: Output budget for short-form helpers
+            max_tokens_long: Output budget for long-form helpers and chat
         """
         self.brand_handle = brand_handle
         self.brand_context = brand_context or {}
-        self.openai_client = OpenAI(api_key=settings.openai_api_key)
-        self.conversation_history = []
+        self.model = model
+        self.max_tokens_short = max_tokens_short
+        self.max_tokens_long = max_tokens_long
+        self.openai_client = _get_shared_client()
+        self.conversation_history: List[Turn] = []
         self.session_id = datetime.now().strftime("%Y%m%d_%H%M%S")
 
+        # Flatten brand_context into joined strings once, then build the
+        # system prompt once - it only changes with brand_context, and
+        # keeping it byte-identical across requests lets OpenAI's
+        # server-side prompt cache kick in
+        self._ctx = self._build_context_fragments()
+        self._system_prompt = _intern_prompt(self._build_system_prompt())
+        self._build_mini_prompts()
+
+        # Persistent outgoing message list - appended in place per turn so
+        # each request is O(1) instead of rebuilding O(N) dicts
+        self._api_messages: List[Dict] = [
+            {"role": "system", "content": self._system_prompt}
+        ]
+
+        # Rolling summary of conversation turns that fell out of the window
+        self._history_summary = ""
+        self._summarized_upto = 0
+
+        # Append-only NDJSON turn log - each turn is persisted as it happens,
+        # so a crash never loses conversation state
+        os.makedirs("conversations", exist_ok=True)
+        self._log_path = os.path.join(
+            "conversations", f"turns_{self.brand_handle}_{self.session_id}.ndjson"
+        )
+        self._log = open(self._log_path, "ab")
+
+
+    def update_brand_context(self, brand_context: Optional[Dict]):
+        """Replace the brand context and rebuild the cached system prompt."""
+        self.brand_context = brand_context or {}
+        self._ctx = self._build_context_fragments()
+        self._system_prompt = _intern_prompt(self._build_system_prompt())
+        self._build_mini_prompts()
+        self._api_messages[0] = {"role": "system", "content": self._system_prompt}
+
+    def _build_mini_prompts(self):
+        """
+        Build task-specific mini system prompts.
+
+        The helpers don't need the full ~2KB brand DNA blob every call -
+        a few hundred bytes of the relevant context cuts their input
+        tokens (and TTFT) several-fold. Only interactive chat keeps the
+        full system prompt.
+        """
+        self._sys_short = _intern_prompt(
+            f"You are Pixaro Brand AI, an expert marketing strategist for {self.brand_handle}. "
+            f"Tone: {self._ctx['tone']}. Core values: {self._ctx['values_str']}. "
+            "Be specific, data-driven, and actionable."
+        )
+        self._sys_competitor = _intern_prompt(
+            self._sys_short +
+            f" Known competitors: {self._ctx['competitor_names_str']}. "
+            f"Market position: {self._ctx['market_position']}. "
+            f"Unique advantages: {self._ctx['advantages_str']}."
+        )
+        self._sys_audience = _intern_prompt(
+            self._sys_short +
+            f" Audience: {self._ctx['demographics']}. "
+            f"Psychographics: {self._ctx['psychographics']}. "
+            f"Pain points: {self._ctx['pain_points_str']}."
+        )
+
+    def _build_context_fragments(self) -> Dict[str, str]:
+        """Pre-join the brand context lists into reusable string fragments."""
+        brand_dna = self.brand_context.get('brand_dna', {})
+        audience = self.brand_context.get('audience', {})
+        competitors = self.brand_context.get('competitors', {})
+
+        fragments = {
+            "tone": brand_dna.get('tone', 'Professional, engaging'),
+            "values_str": ', '.join(brand_dna.get('values', ['Innovation', 'Quality', 'Trust'])),
+            "values_short_str": ', '.join(brand_dna.get('values', [])[:2]),
+            "personality_str": ', '.join(brand_dna.get('personality', ['Authentic', 'Bold', 'Creative'])),
+            "voice": brand_dna.get('voice', 'Confident and approachable'),
+            "demographics": audience.get('demographics', 'Young professionals, 25-40'),
+            "psychographics": audience.get('psychographics', 'Tech-savvy, growth-minded'),
+            "pain_points_str": ', '.join(audience.get('pain_points', ['Time management', 'Scaling challenges'])),
+            "content_prefs_str": ', '.join(audience.get('content_prefs', ['Educational', 'Visual', 'Data-driven'])),
+            "competitor_names_str": ', '.join(competitors.get('names', ['Competitor A', 'Competitor B'])),
+            "market_position": competitors.get('position', 'Growing challenger brand'),
+            "advantages_str": ', '.join(competitors.get('advantages', ['Innovation', 'Customer service'])),
+        }
+
+        # Share the fragment strings across sessions for the same brand
+        return {key: _intern_prompt(value) for key, value in fragments.items()}
+
     def _build_system_prompt(self) -> str:
         """Build comprehensive system prompt with brand context."""
 
@@ -73,29 +449,25 @@ RESPONSE STYLE:
 
         # Add brand context if available
         if self.brand_context:
-            brand_dna = self.brand_context.get('brand_dna', {})
-            audience = self.brand_context.get('audience', {})
-            competitors = self.brand_context.get('competitors', {})
-
             context_prompt = f"""
 BRAND CONTEXT YOU KNOW:
 
 Brand DNA:
-- Tone: {brand_dna.get('tone', 'Professional, engaging')}
-- Core Values: {', '.join(brand_dna.get('values', ['Innovation', 'Quality', 'Trust']))}
-- Personality Traits: {', '.join(brand_dna.get('personality', ['Authentic', 'Bold', 'Creative']))}
-- Brand Voice: {brand_dna.get('voice', 'Confident and approachable')}
+- Tone: {self._ctx['tone']}
+- Core Values: {self._ctx['values_str']}
+- Personality Traits: {self._ctx['personality_str']}
+- Brand Voice: {self._ctx['voice']}
 
 Target Audience:
-- Primary Demographics: {audience.get('demographics', 'Young professionals, 25-40')}
-- Psychographics: {audience.get('psychographics', 'Tech-savvy, growth-minded')}
-- Pain Points: {', '.join(audience.get('pain_points', ['Time management', 'Scaling challenges']))}
-- Content Preferences: {', '.join(audience.get('content_prefs', ['Educational', 'Visual', 'Data-driven']))}
+- Primary Demographics: {self._ctx['demographics']}
+- Psychographics: {self._ctx['psychographics']}
+- Pain Points: {self._ctx['pain_points_str']}
+- Content Preferences: {self._ctx['content_prefs_str']}
 
 Competitors:
-- Main Competitors: {', '.join(competitors.get('names', ['Competitor A', 'Competitor B']))}
-- Market Position: {competitors.get('position', 'Growing challenger brand')}
-- Unique Advantages: {', '.join(competitors.get('advantages', ['Innovation', 'Customer service']))}
+- Main Competitors: {self._ctx['competitor_names_str']}
+- Market Position: {self._ctx['market_position']}
+- Unique Advantages: {self._ctx['advantages_str']}
 
 """
             base_prompt += context_prompt
@@ -137,7 +509,7 @@ Always be proactive - suggest what they should do next based on their questions.
 
         return base_prompt
 
-    def chat(self, user_message: str) -> Dict:
+    async def chat(self, user_message: str) -> Dict:
         """
         Main chat interface - handles all user queries.
 
@@ -147,12 +519,12 @@ Always be proactive - suggest what they should do next based on their questions.
         Returns:
             Dict with response, action_type, and metadata
         """
+        # One timestamp per turn - datetime.now() is a syscall, no need to
+        # repeat it for every append and return
+        ts = datetime.now().isoformat()
+
         # Add user message to history
-        self.conversation_history.append({
-            "role": "user",
-            "content": user_message,
-            "timestamp": datetime.now().isoformat()
-        })
+        self._record_turn("user", user_message, timestamp=ts)
 
         # Check for special commands
         action_type = self._detect_action_type(user_message)
@@ -160,59 +532,68 @@ Always be proactive - suggest what they should do next based on their questions.
         # Handle image generation requests
         if action_type == "generate_image":
             # Extract the image description from the user message
-            image_result = self.generate_image(user_message)
+            image_result = await self.generate_image(user_message)
 
             if image_result.get("success"):
                 assistant_response = f"I've generated an image for you! Here's what I created:\n\n{image_result.get('prompt')}\n\nWould you like me to create another variation or adjust anything?"
 
                 # Add to history
-                self.conversation_history.append({
-                    "role": "assistant",
-                    "content": assistant_response,
-                    "timestamp": datetime.now().isoformat(),
-                    "image_url": image_result.get("image_url")
-                })
+                self._record_turn(
+                    "assistant", assistant_response,
+                    image_url=image_result.get("image_url"),
+                    timestamp=ts
+                )
 
                 return {
                     "response": assistant_response,
                     "action_type": action_type,
                     "needs_report": False,
                     "image_url": image_result.get("image_url"),
-                    "timestamp": datetime.now().isoformat()
+                    "timestamp": ts
                 }
             else:
                 assistant_response = f"I encountered an error generating the image: {image_result.get('error')}. Let me help you with the concept instead."
 
-        # Build messages for OpenAI
-        messages = [
-            {"role": "system", "content": self._build_system_prompt()},
-            *[{"role": msg["role"], "content": msg["content"]}
-              for msg in self.conversation_history]
-        ]
+        # Serve near-duplicate questions straight from the semantic
+        # cache - but only opening messages. Follow-ups ("tell me
+        # more") depend on everything said so far: answering them from
+        # another conversation's cache entry is wrong, and storing them
+        # would poison the cache with context-specific responses filed
+        # under generic keys. The user turn was just recorded, so a
+        # first message means exactly one turn of history.
+        cacheable = len(self.conversation_history) == 1
+        cached_response = await self._cache_lookup(user_message) if cacheable else None
+        if cached_response is not None:
+            self._record_turn("assistant", cached_response, timestamp=ts)
 
-        # Get AI response
+            return {
+                "response": cached_response,
+                "action_type": action_type,
+                "needs_report": "report" in user_message.lower() and ("generate" in user_message.lower() or "send" in user_message.lower()),
+                "timestamp": ts
+            }
+
+        # Build messages for OpenAI (recent window + condensed summary)
+        messages = await self._build_messages()
+
+        # Get AI response (streamed so tokens arrive as they're generated)
         try:
-            response = self.openai_client.chat.completions.create(
-                model="gpt-4-turbo-preview",
-                messages=messages,
-                temperature=0.7,
-                max_tokens=1500
-            )
+            chunks = []
+            async for token in self._stream_completion(messages):
+                chunks.append(token)
+            assistant_response = "".join(chunks)
 
-            assistant_response = response.choices[0].message.content
+            if cacheable:
+                await self._cache_store(user_message, assistant_response)
 
             # Add to history
-            self.conversation_history.append({
-                "role": "assistant",
-                "content": assistant_response,
-                "timestamp": datetime.now().isoformat()
-            })
+            self._record_turn("assistant", assistant_response)
 
             return {
                 "response": assistant_response,
                 "action_type": action_type,
                 "needs_report": "report" in user_message.lower() and ("generate" in user_message.lower() or "send" in user_message.lower()),
-                "timestamp": datetime.now().isoformat()
+                "timestamp": ts
             }
 
         except Exception as e:
@@ -221,40 +602,199 @@ Always be proactive - suggest what they should do next based on their questions.
                 "response": error_response,
                 "action_type": "error",
                 "needs_report": False,
-                "timestamp": datetime.now().isoformat()
+                "timestamp": ts
+            }
+
+    async def chat_stream(self, user_message: str) -> AsyncIterator[str]:
+        """
+        Streaming variant of chat() - yields response tokens as they arrive.
+
+        The API layer can wrap this in a StreamingResponse so users see
+        tokens immediately instead of waiting for the full completion.
+
+        Args:
+            user_message: User's question or command
+
+        Yields:
+            Response text fragments in generation order
+        """
+        # Add user message to history
+        self._record_turn("user", user_message)
+
+        messages = await self._build_messages()
+
+        chunks = []
+        async for token in self._stream_completion(messages):
+            chunks.append(token)
+            yield token
+
+        # Record the full response once streaming completes
+        self._record_turn("assistant", "".join(chunks))
+
+    def _record_turn(
+        self,
+        role: str,
+        content: str,
+        image_url: Optional[str] = None,
+        timestamp: Optional[str] = None
+    ) -> Turn:
+        """Append a turn to the in-memory history and the NDJSON log."""
+        turn = Turn(role, content, timestamp or datetime.now().isoformat(), image_url=image_url)
+
+        self.conversation_history.append(turn)
+        self._api_messages.append({"role": role, "content": content})
+
+        try:
+            self._log.write(orjson.dumps(turn.as_dict()) + b"\n")
+            self._log.flush()
+        except Exception as e:
+            print(f"Warning: failed to log turn: {e}")
+
+        return turn
+
+    def _cache_check_sync(self, prompt: str):
+        """Worker-thread body of _cache_lookup (may build the cache)"""
+        cache = _get_semantic_cache(self.brand_handle)
+        if cache is None:
+            return None
+        return cache.check(prompt=prompt)
+
+    def _cache_store_sync(self, prompt: str, response: str):
+        """Worker-thread body of _cache_store (may build the cache)"""
+        cache = _get_semantic_cache(self.brand_handle)
+        if cache is not None:
+            cache.store(prompt=prompt, response=response)
+
+    async def _cache_lookup(self, prompt: str) -> Optional[str]:
+        """Return a semantically-cached response for prompt, or None."""
+        try:
+            hit = await asyncio.to_thread(self._cache_check_sync, prompt)
+            if hit:
+                return hit[0]["response"]
+        except Exception as e:
+            print(f"Warning: semantic cache check failed: {e}")
+
+        return None
+
+    async def _cache_store(self, prompt: str, response: str):
+        """Store a prompt/response pair in the semantic cache."""
+        try:
+            await asyncio.to_thread(self._cache_store_sync, prompt, response)
+        except Exception as e:
+            print(f"Warning: semantic cache store failed: {e}")
+
+    async def _build_messages(self) -> List[Dict]:
+        """
+        Return the persistent outgoing message list for this turn.
+
+        Turns are appended in place as they're recorded, so this is O(1)
+        per request. Once more than 2 * HISTORY_WINDOW turn messages have
+        piled up, the oldest are folded into a rolling summary message and
+        deleted in place, so prompt size (and therefore TTFT) stays bounded
+        as the session grows.
+        """
+        turns_in_list = len(self.conversation_history) - self._summarized_upto
+        overflow = turns_in_list - 2 * HISTORY_WINDOW
+
+        if overflow >= CONDENSE_EVERY:
+            await self._condense_history(self._summarized_upto + overflow)
+
+        return self._api_messages
+
+    async def _condense_history(self, upto: int):
+        """Fold conversation turns [:upto] into the rolling summary."""
+        new_turns = self.conversation_history[self._summarized_upto:upto]
+        transcript = "\n".join(f"{turn.role}: {turn.content}" for turn in new_turns)
+
+        prompt = "Condense this marketing strategy conversation into a short summary, keeping decisions, brand facts, and open questions."
+        if self._history_summary:
+            prompt += f"\n\nExisting summary:\n{self._history_summary}"
+        prompt += f"\n\nNew turns:\n{transcript}"
+
+        try:
+            async with _openai_semaphore:
+                response = await self.openai_client.chat.completions.create(
+                    model="gpt-4o-mini",
+                    messages=[{"role": "user", "content": prompt}],
+                    temperature=0.3,
+                    max_tokens=300
+                )
+
+            had_summary = bool(self._history_summary)
+            folded = upto - self._summarized_upto
+            self._history_summary = response.choices[0].message.content
+            self._summarized_upto = upto
+
+            # Drop the folded turns from the persistent message list and
+            # refresh the summary slot right after the system prompt
+            head = 2 if had_summary else 1
+            del self._api_messages[head:head + folded]
+
+            summary_message = {
+                "role": "system",
+                "content": f"Summary of the conversation so far:\n{self._history_summary}"
             }
+            if had_summary:
+                self._api_messages[1] = summary_message
+            else:
+                self._api_messages.insert(1, summary_message)
+
+        except Exception as e:
+            # Keep the previous summary on failure - worst case we just
+            # lose some old context for this turn
+            print(f"Warning: history condenser failed: {e}")
+
+    async def _stream_completion(
+        self,
+        messages: List[Dict],
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None
+    ) -> AsyncIterator[str]:
+        """Stream a chat completion, yielding content tokens as they arrive."""
+        if max_tokens is None:
+            # ~4 chars/token heuristic: don't over-provision output budget
+            # when the prompt is already large
+            prompt_chars = sum(len(m["content"]) for m in messages)
+            max_tokens = max(256, min(self.max_tokens_long, 4096 - prompt_chars // 4))
+
+        async with _openai_semaphore:
+            stream = await self.openai_client.chat.completions.create(
+                model=self.model,
+                messages=messages,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                stream=True
+            )
+
+            async for chunk in stream:
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if delta:
+                    yield delta
 
     def _detect_action_type(self, message: str) -> str:
         """Detect what type of action the user is requesting."""
         message_lower = message.lower()
 
-        # Image generation - check this FIRST and be more flexible with detection
-        if any(phrase in message_lower for phrase in [
-            "create a image", "create an image", "generate a image", "generate an image",
-            "generate image", "make image", "make a image", "make an image",
-            "create a photo", "create photo", "generate a photo", "generate photo", "make photo",
-            "design a post", "design post", "create visual", "generate visual",
-            "make a post photo", "create post image", "image of", "photo of",
-            "image about", "photo about", "picture of", "picture about",
-            "graphic about", "graphic of", "design about"
-        ]):
-            return "generate_image"
-        elif any(word in message_lower for word in ["generate report", "send report", "create report", "email report"]):
-            return "generate_report"
-        elif any(word in message_lower for word in ["generate post", "create caption", "write post", "generate content"]):
-            return "generate_content"
-        elif any(word in message_lower for word in ["competitor", "competition", "rival"]):
-            return "competitor_analysis"
-        elif any(word in message_lower for word in ["predict", "forecast", "what if", "scenario"]):
-            return "predictive_analysis"
-        elif any(word in message_lower for word in ["persona", "audience segment", "who is"]):
-            return "audience_insights"
-        elif any(word in message_lower for word in ["campaign", "strategy", "plan"]):
-            return "campaign_creation"
-        else:
+        if _hs_db is not None:
+            matched = []
+
+            def on_match(pattern_id, start, end, flags, context):
+                matched.append(pattern_id)
+
+            _hs_db.scan(message_lower.encode(), match_event_handler=on_match)
+
+            if matched:
+                # Lowest pattern id wins, preserving _ACTION_PATTERNS precedence
+                return _ACTION_PATTERNS[min(matched)][1]
             return "general_chat"
 
-    def generate_image(self, prompt: str, size: str = "1024x1024") -> Dict:
+        for pattern, action_type in _ACTION_PATTERNS:
+            if pattern.search(message_lower):
+                return action_type
+
+        return "general_chat"
+
+    async def generate_image(self, prompt: str, size: str = "1024x1024") -> Dict:
         """
         Generate an image using DALL-E based on the user's description.
 
@@ -265,34 +805,57 @@ Always be proactive - suggest what they should do next based on their questions.
         Returns:
             Dict with image_url and prompt
         """
+        ts = datetime.now().isoformat()
+
         try:
             # Enhance the prompt with brand context if available
             brand_context_str = ""
             if self.brand_context:
-                brand_dna = self.brand_context.get('brand_dna', {})
-                tone = brand_dna.get('tone', 'professional')
-                values = brand_dna.get('values', [])
-                brand_context_str = f" The style should be {tone}"
-                if values:
-                    brand_context_str += f" and reflect values of {', '.join(values[:2])}"
+                brand_context_str = f" The style should be {self._ctx['tone']}"
+                if self._ctx['values_short_str']:
+                    brand_context_str += f" and reflect values of {self._ctx['values_short_str']}"
 
             enhanced_prompt = f"{prompt}.{brand_context_str}. High quality, professional social media post design."
 
-            response = self.openai_client.images.generate(
-                model="dall-e-3",
-                prompt=enhanced_prompt,
-                size=size,
-                quality="standard",
-                n=1,
-            )
+            # DALL-E URLs expire in ~1 hour, so persist the bytes locally,
+            # keyed by prompt hash - exact repeats never re-hit the API
+            key = hashlib.sha256(f"{enhanced_prompt}|{size}".encode()).hexdigest()
+            image_path = Path(settings.output_dir) / "images" / f"{key}.png"
+            image_url = f"/outputs/images/{key}.png"
 
-            image_url = response.data[0].url
+            if image_path.exists():
+                return {
+                    "image_url": image_url,
+                    "image_path": str(image_path),
+                    "prompt": prompt,
+                    "enhanced_prompt": enhanced_prompt,
+                    "cached": True,
+                    "timestamp": ts,
+                    "success": True
+                }
+
+            async with _openai_semaphore:
+                # b64_json skips the extra round-trip to OpenAI's CDN
+                response = await self.openai_client.images.generate(
+                    model="dall-e-3",
+                    prompt=enhanced_prompt,
+                    size=size,
+                    quality="standard",
+                    response_format="b64_json",
+                    n=1,
+                )
+
+            image_bytes = base64.b64decode(response.data[0].b64_json)
+            image_path.parent.mkdir(parents=True, exist_ok=True)
+            await asyncio.to_thread(image_path.write_bytes, image_bytes)
 
             return {
                 "image_url": image_url,
+                "image_path": str(image_path),
                 "prompt": prompt,
                 "enhanced_prompt": enhanced_prompt,
-                "timestamp": datetime.now().isoformat(),
+                "cached": False,
+                "timestamp": ts,
                 "success": True
             }
 
@@ -301,13 +864,16 @@ Always be proactive - suggest what they should do next based on their questions.
                 "error": str(e),
                 "prompt": prompt,
                 "success": False,
-                "timestamp": datetime.now().isoformat()
+                "timestamp": ts
             }
 
-    def generate_instagram_posts(self, topic: str, count: int = 5) -> List[Dict]:
+    async def generate_instagram_posts(self, topic: str, count: int = 5) -> List[Dict]:
         """
         Generate ready-to-use Instagram posts with captions.
 
+        Uses structured outputs, so one completion returns the whole batch
+        as validated JSON - no free-form text parsing.
+
         Args:
             topic: Topic or theme for posts
             count: Number of posts to generate
@@ -315,63 +881,28 @@ Always be proactive - suggest what they should do next based on their questions.
         Returns:
             List of post dicts with caption, hashtags, best_time
         """
-        prompt = f"""Create {count} Instagram post captions for {self.brand_handle} about: {topic}
-
-For each post, provide:
-1. Engaging caption (150-200 characters)
-2. Relevant hashtags (5-8 hashtags)
-3. Best posting time
-4. Content type suggestion (carousel, reel, static image)
-
-Make sure captions match the brand voice and tone. Include call-to-actions."""
+        prompt = _IG_POSTS_TMPL.format(count=count, handle=self.brand_handle, topic=topic)
 
         try:
-            response = self.openai_client.chat.completions.create(
-                model="gpt-4-turbo-preview",
-                messages=[
-                    {"role": "system", "content": self._build_system_prompt()},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.8,
-                max_tokens=2000
-            )
-
-            content = response.choices[0].message.content
-
-            # Parse the response into structured posts
-            posts = self._parse_instagram_posts(content)
-            return posts
+            async with _openai_semaphore:
+                response = await self.openai_client.beta.chat.completions.parse(
+                    model="gpt-4o-2024-08-06",
+                    messages=[
+                        {"role": "system", "content": self._sys_short},
+                        {"role": "user", "content": prompt}
+                    ],
+                    response_format=IGPostBatch,
+                    temperature=0.8,
+                    max_tokens=self.max_tokens_long
+                )
+
+            batch = response.choices[0].message.parsed
+            return [post.model_dump() for post in batch.posts]
 
         except Exception as e:
             return [{"error": str(e), "caption": "Error generating posts"}]
 
-    def _parse_instagram_posts(self, ai_response: str) -> List[Dict]:
-        """Parse AI response into structured post objects."""
-        posts = []
-        lines = ai_response.split('\n')
-
-        current_post = {}
-        for line in lines:
-            line = line.strip()
-            if line.startswith('Post ') or line.startswith('**Post'):
-                if current_post:
-                    posts.append(current_post)
-                current_post = {}
-            elif 'caption:' in line.lower():
-                current_post['caption'] = line.split(':', 1)[1].strip()
-            elif 'hashtag' in line.lower():
-                current_post['hashtags'] = line.split(':', 1)[1].strip()
-            elif 'time' in line.lower() or 'posting' in line.lower():
-                current_post['best_time'] = line.split(':', 1)[1].strip()
-            elif 'type' in line.lower():
-                current_post['content_type'] = line.split(':', 1)[1].strip()
-
-        if current_post:
-            posts.append(current_post)
-
-        return posts if posts else [{"caption": ai_response, "hashtags": "", "best_time": "Peak hours", "content_type": "Static"}]
-
-    def predict_engagement(self, content_idea: str, platform: str = "Instagram") -> Dict:
+    async def predict_engagement(self, content_idea: str, platform: str = "Instagram") -> Dict:
         """
         Predict engagement for a content idea.
 
@@ -382,30 +913,27 @@ Make sure captions match the brand voice and tone. Include call-to-actions."""
         Returns:
             Dict with predicted metrics and recommendations
         """
-        prompt = f"""Analyze this content idea for {platform}: "{content_idea}"
-
-Provide predictions for:
-1. Engagement Rate (estimate %)
-2. Expected Reach (Low/Medium/High)
-3. Audience Sentiment (Positive/Neutral/Negative)
-4. Viral Potential Score (1-10)
-5. Best Day/Time to Post
-6. Recommendations to improve engagement
-
-Base predictions on brand DNA and typical audience behavior for {self.brand_handle}."""
+        prompt = _PREDICT_TMPL.format(
+            platform=platform, content_idea=content_idea, handle=self.brand_handle
+        )
 
         try:
-            response = self.openai_client.chat.completions.create(
-                model="gpt-4-turbo-preview",
-                messages=[
-                    {"role": "system", "content": self._build_system_prompt()},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.6,
-                max_tokens=1000
-            )
-
-            content = response.choices[0].message.content
+            content = await self._cache_lookup(prompt)
+
+            if content is None:
+                async with _openai_semaphore:
+                    response = await self.openai_client.chat.completions.create(
+                        model=self.model,
+                        messages=[
+                            {"role": "system", "content": self._sys_audience},
+                            {"role": "user", "content": prompt}
+                        ],
+                        temperature=0.6,
+                        max_tokens=self.max_tokens_short
+                    )
+
+                content = response.choices[0].message.content
+                await self._cache_store(prompt, content)
 
             return {
                 "prediction": content,
@@ -417,7 +945,7 @@ Base predictions on brand DNA and typical audience behavior for {self.brand_hand
         except Exception as e:
             return {"error": str(e), "prediction": "Unable to generate prediction"}
 
-    def create_campaign(self, goal: str, duration: str = "1 month", budget: str = "Medium") -> Dict:
+    async def create_campaign(self, goal: str, duration: str = "1 month", budget: str = "Medium") -> Dict:
         """
         Create a complete marketing campaign.
 
@@ -429,36 +957,27 @@ Base predictions on brand DNA and typical audience behavior for {self.brand_hand
         Returns:
             Dict with complete campaign strategy
         """
-        prompt = f"""Create a complete marketing campaign for {self.brand_handle}:
-
-Goal: {goal}
-Duration: {duration}
-Budget: {budget}
-
-Provide:
-1. Campaign Overview (objectives, KPIs)
-2. Target Audience Segments
-3. Content Calendar (week-by-week breakdown)
-4. Channel Strategy (which platforms, why)
-5. Creative Concepts (3-5 content ideas)
-6. Budget Allocation
-7. Success Metrics
-8. Risk Mitigation
-
-Make it actionable and specific to the brand's DNA and audience."""
+        prompt = _CAMPAIGN_TMPL.format(
+            handle=self.brand_handle, goal=goal, duration=duration, budget=budget
+        )
 
         try:
-            response = self.openai_client.chat.completions.create(
-                model="gpt-4-turbo-preview",
-                messages=[
-                    {"role": "system", "content": self._build_system_prompt()},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.7,
-                max_tokens=2500
-            )
-
-            campaign = response.choices[0].message.content
+            campaign = await self._cache_lookup(prompt)
+
+            if campaign is None:
+                async with _openai_semaphore:
+                    response = await self.openai_client.chat.completions.create(
+                        model=self.model,
+                        messages=[
+                            {"role": "system", "content": self._sys_short},
+                            {"role": "user", "content": prompt}
+                        ],
+                        temperature=0.7,
+                        max_tokens=self.max_tokens_long
+                    )
+
+                campaign = response.choices[0].message.content
+                await self._cache_store(prompt, campaign)
 
             return {
                 "campaign": campaign,
@@ -471,7 +990,7 @@ Make it actionable and specific to the brand's DNA and audience."""
         except Exception as e:
             return {"error": str(e), "campaign": "Unable to generate campaign"}
 
-    def analyze_competitor(self, competitor_name: str) -> Dict:
+    async def analyze_competitor(self, competitor_name: str) -> Dict:
         """
         Deep dive competitor analysis.
 
@@ -481,42 +1000,27 @@ Make it actionable and specific to the brand's DNA and audience."""
         Returns:
             Dict with competitor insights and opportunities
         """
-        prompt = f"""Analyze competitor: {competitor_name} for {self.brand_handle}
-
-Provide:
-1. Content Strategy Analysis
-   - What are they posting?
-   - Posting frequency and timing
-   - Engagement patterns
-
-2. Strengths & Weaknesses
-   - What are they doing well?
-   - What are their gaps?
-
-3. Opportunities for {self.brand_handle}
-   - Content gaps we can fill
-   - Underserved audience segments
-   - Better positioning angles
-
-4. Actionable Recommendations
-   - 3 things we should do differently
-   - 2 things we should learn from them
-   - 1 bold move to differentiate
-
-Be specific and actionable."""
+        prompt = _COMPETITOR_TMPL.format(
+            competitor=competitor_name, handle=self.brand_handle
+        )
 
         try:
-            response = self.openai_client.chat.completions.create(
-                model="gpt-4-turbo-preview",
-                messages=[
-                    {"role": "system", "content": self._build_system_prompt()},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.7,
-                max_tokens=2000
-            )
-
-            analysis = response.choices[0].message.content
+            analysis = await self._cache_lookup(prompt)
+
+            if analysis is None:
+                async with _openai_semaphore:
+                    response = await self.openai_client.chat.completions.create(
+                        model=self.model,
+                        messages=[
+                            {"role": "system", "content": self._sys_competitor},
+                            {"role": "user", "content": prompt}
+                        ],
+                        temperature=0.7,
+                        max_tokens=self.max_tokens_long
+                    )
+
+                analysis = response.choices[0].message.content
+                await self._cache_store(prompt, analysis)
 
             return {
                 "analysis": analysis,
@@ -528,41 +1032,44 @@ Be specific and actionable."""
         except Exception as e:
             return {"error": str(e), "analysis": "Unable to analyze competitor"}
 
-    def get_audience_personas(self) -> Dict:
+    async def get_audience_personas(self) -> Dict:
         """
         Get detailed audience micro-personas.
 
+        The four personas are requested in parallel, so wall-clock time is
+        one small completion instead of one long one.
+
         Returns:
             Dict with 4 detailed personas
         """
-        prompt = f"""Create 4 detailed audience micro-personas for {self.brand_handle}:
 
-For each persona, provide:
-1. Name & Age (e.g., "Sarah, 28")
-2. Job Title & Industry
-3. Key Characteristics (3-4 traits)
-4. Pain Points (2-3 specific problems)
-5. Content Preferences (what they engage with)
-6. Best Way to Reach Them (channel + message type)
-7. Engagement Behavior (when/how they interact)
+        async def one_persona(num: int) -> str:
+            prompt = _PERSONA_TMPL.format(num=num, handle=self.brand_handle)
 
-Make them realistic and actionable for targeted marketing."""
+            persona = await self._cache_lookup(prompt)
+            if persona is not None:
+                return persona
 
-        try:
-            response = self.openai_client.chat.completions.create(
-                model="gpt-4-turbo-preview",
-                messages=[
-                    {"role": "system", "content": self._build_system_prompt()},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.7,
-                max_tokens=2000
-            )
+            async with _openai_semaphore:
+                response = await self.openai_client.chat.completions.create(
+                    model=self.model,
+                    messages=[
+                        {"role": "system", "content": self._sys_audience},
+                        {"role": "user", "content": prompt}
+                    ],
+                    temperature=0.7,
+                    max_tokens=500
+                )
+
+            persona = response.choices[0].message.content
+            await self._cache_store(prompt, persona)
+            return persona
 
-            personas = response.choices[0].message.content
+        try:
+            personas = await asyncio.gather(*(one_persona(n) for n in range(1, 5)))
 
             return {
-                "personas": personas,
+                "personas": "\n\n".join(personas),
                 "brand": self.brand_handle,
                 "created": datetime.now().isoformat()
             }
@@ -570,40 +1077,45 @@ Make them realistic and actionable for targeted marketing."""
         except Exception as e:
             return {"error": str(e), "personas": "Unable to generate personas"}
 
-    def weekly_content_strategy(self) -> Dict:
+    async def weekly_content_strategy(self) -> Dict:
         """
         Generate a week-long content strategy.
 
+        The seven day plans are requested in parallel and gathered, so
+        total latency is max(7 small completions) instead of one long one.
+
         Returns:
             Dict with day-by-day content plan
         """
-        prompt = f"""Create a 7-day content strategy for {self.brand_handle}:
-
-For each day (Monday-Sunday), provide:
-1. Content Theme/Topic
-2. Platform (Instagram/LinkedIn/Twitter/etc.)
-3. Content Format (Reel/Carousel/Story/Post)
-4. Caption Template (with hashtags)
-5. Best Posting Time
-6. CTA (call-to-action)
-
-Make sure there's variety in content types and themes. Align with brand DNA and audience preferences."""
+        days = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+
+        async def plan_day(day: str) -> str:
+            prompt = _DAY_PLAN_TMPL.format(day=day, handle=self.brand_handle)
+
+            plan = await self._cache_lookup(prompt)
+            if plan is not None:
+                return plan
+
+            async with _openai_semaphore:
+                response = await self.openai_client.chat.completions.create(
+                    model=self.model,
+                    messages=[
+                        {"role": "system", "content": self._sys_short},
+                        {"role": "user", "content": prompt}
+                    ],
+                    temperature=0.7,
+                    max_tokens=350
+                )
+
+            plan = response.choices[0].message.content
+            await self._cache_store(prompt, plan)
+            return plan
 
         try:
-            response = self.openai_client.chat.completions.create(
-                model="gpt-4-turbo-preview",
-                messages=[
-                    {"role": "system", "content": self._build_system_prompt()},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.7,
-                max_tokens=2500
-            )
-
-            strategy = response.choices[0].message.content
+            plans = await asyncio.gather(*(plan_day(day) for day in days))
 
             return {
-                "weekly_plan": strategy,
+                "weekly_plan": dict(zip(days, plans)),
                 "brand": self.brand_handle,
                 "created": datetime.now().isoformat()
             }
@@ -613,11 +1125,14 @@ Make sure there's variety in content types and themes. Align with brand DNA and
 
     def get_conversation_history(self) -> List[Dict]:
         """Get full conversation history."""
-        return self.conversation_history
+        return [turn.as_dict() for turn in self.conversation_history]
 
     def clear_conversation(self):
         """Clear conversation history for new session."""
-        self.conversation_history = []
+        self.conversation_history: List[Turn] = []
+        self._api_messages = [{"role": "system", "content": self._system_prompt}]
+        self._history_summary = ""
+        self._summarized_upto = 0
         self.session_id = datetime.now().strftime("%Y%m%d_%H%M%S")
 
     def export_conversation(self, filepath: str = None) -> str:
@@ -638,12 +1153,15 @@ Make sure there's variety in content types and themes. Align with brand DNA and
         export_data = {
             "brand_handle": self.brand_handle,
             "session_id": self.session_id,
-            "conversation": self.conversation_history,
+            "conversation": [turn.as_dict() for turn in self.conversation_history],
             "brand_context": self.brand_context,
             "exported_at": datetime.now().isoformat()
         }
 
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(export_data, f, indent=2, ensure_ascii=False)
+        with open(filepath, 'wb') as f:
+            f.write(orjson.dumps(
+                export_data,
+                option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+            ))
 
         return filepath
@@ -1,11 +1,18 @@
-from pydantic_settings import BaseSettings
+from pydantic_settings import BaseSettings, SettingsConfigDict
 from typing import Optional
-import os
+from functools import lru_cache
+from pathlib import Path
 
 
 class Settings(BaseSettings):
     """Application settings loaded from environment variables"""
 
+    # protected_namespaces=() lets the model_deep/model_fast fields
+    # coexist with pydantic's reserved model_ prefix without warnings
+    model_config = SettingsConfigDict(
+        env_file=".env", case_sensitive=False, protected_namespaces=()
+    )
+
     # API Configuration
     api_host: str = "0.0.0.0"
     api_port: int = 8000
@@ -20,6 +27,11 @@ class Settings(BaseSettings):
     smtp_password: str
     sender_email: str
     sender_name: str = "Pixaro AI Agent"
+    smtp_pool_size: int = 5
+    smtp_max_msgs_per_conn: int = 100  # rotate before provider rate limits
+    smtp_pipelining: bool = True  # disable if the MTA mishandles RFC 2920
+    email_workers: int = 8  # background threads for fire-and-forget sends
+    stream_attach_threshold: int = 1048576  # stream attachments over 1MB to the socket
 
     # AI Service API Keys
     openai_api_key: Optional[str] = None
@@ -28,10 +40,21 @@ class Settings(BaseSettings):
     google_ai_api_key: Optional[str] = None  # For Gemini (not Veo 3)
     runway_api_key: Optional[str] = None  # For Runway ML Gen-3 video
 
+    # Model selection - the deep model handles the nuanced brand DNA
+    # work, the fast model covers the cheaper structured sub-analyses
+    model_deep: str = "gpt-4o"
+    model_fast: str = "gpt-4o-mini"
+    openai_max_concurrency: int = 20  # global cap on in-flight OpenAI calls
+
     # Video Generation Settings
     use_runway: bool = True  # Use Runway ML for professional videos
     video_fallback: bool = True  # Fallback if video generation fails
 
+    # Artifact hosting - when set, large email attachments are uploaded
+    # here and delivered as signed download links instead of base64
+    artifact_bucket: Optional[str] = None
+    artifact_url_expiry: int = 7 * 86400  # signed link lifetime (seconds)
+
     # Storage Configuration
     upload_dir: str = "./uploads"
     output_dir: str = "./outputs"
@@ -42,19 +65,23 @@ class Settings(BaseSettings):
     video_fps: int = 30
     image_max_size: int = 2048
 
-    class Config:
-        env_file = ".env"
-        case_sensitive = False
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Parse settings exactly once - env/.env parsing is not free."""
+    return Settings()
 
 
-# Create directories if they don't exist
 def ensure_directories():
     """Ensure upload and output directories exist"""
-    settings = Settings()
-    os.makedirs(settings.upload_dir, exist_ok=True)
-    os.makedirs(settings.output_dir, exist_ok=True)
-    os.makedirs(f"{settings.output_dir}/images", exist_ok=True)
-    os.makedirs(f"{settings.output_dir}/videos", exist_ok=True)
+    s = get_settings()
+    for directory in (
+        s.upload_dir,
+        s.output_dir,
+        f"{s.output_dir}/images",
+        f"{s.output_dir}/videos",
+    ):
+        Path(directory).mkdir(parents=True, exist_ok=True)
 
 
-settings = Settings()
+settings = get_settings()
@@ -1,13 +1,376 @@
+import asyncio
+import logging
 import smtplib
+import mimetypes
+import queue
+import threading
+import time
+import atexit
+import copy
+from binascii import b2a_base64
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import lru_cache
+from html import escape
+from io import BytesIO
+from email import policy
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 from email.mime.base import MIMEBase
-from email import encoders
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Optional, Union
+from jinja2 import Environment, FileSystemLoader
+from batch_sender import BatchSender
 from config import settings
 import os
 
+logger = logging.getLogger(__name__)
+
+_s3_client = None
+
+
+def upload_artifact(file_path: str) -> Optional[str]:
+    """
+    Upload a generated artifact to object storage and return a signed
+    download URL.
+
+    Returns None when no bucket is configured or the upload fails, in
+    which case the caller falls back to attaching the file inline.
+    """
+    global _s3_client
+
+    if not settings.artifact_bucket:
+        return None
+
+    try:
+        if _s3_client is None:
+            import boto3
+            _s3_client = boto3.client('s3')
+
+        key = f"artifacts/{Path(file_path).name}"
+        _s3_client.upload_file(file_path, settings.artifact_bucket, key)
+        return _s3_client.generate_presigned_url(
+            'get_object',
+            Params={'Bucket': settings.artifact_bucket, 'Key': key},
+            ExpiresIn=settings.artifact_url_expiry
+        )
+
+    except Exception:
+        logger.exception("Failed to upload artifact %s", file_path)
+        return None
+
+
+# Read size is a multiple of 57 bytes so every chunk encodes to
+# whole 76-char base64 lines and chunks can be concatenated
+_B64_CHUNK = 57 * 1024
+
+
+@lru_cache(maxsize=2048)
+def _join_hashtags(tags: tuple) -> str:
+    """
+    Join a hashtag tuple into one string.
+
+    The generator draws hashtags from a small trending vocabulary, so
+    the same sets recur across sends; memoizing skips the per-call
+    join allocation.
+    """
+    return " ".join(tags)
+
+
+# Inline style so the link renders as a button in every template
+_LINK_STYLE = (
+    "display:inline-block;background:#667eea;color:white;"
+    "padding:12px 30px;text-decoration:none;border-radius:5px;margin:10px 0;"
+)
+
+
+class PipelinedSMTP(smtplib.SMTP):
+    """
+    SMTP client that pipelines MAIL FROM / RCPT TO / DATA (RFC 2920).
+
+    Stock smtplib waits for a server reply after each command, costing
+    one network round-trip per command. When the server advertises the
+    PIPELINING extension, the three envelope commands are written
+    back-to-back and their replies read together, collapsing ~3 RTTs
+    into 1 per message.
+    """
+
+    def sendmail(self, from_addr, to_addrs, msg, mail_options=(),
+                 rcpt_options=()):
+        self.ehlo_or_helo_if_needed()
+
+        if 'pipelining' not in self.esmtp_features:
+            return super().sendmail(
+                from_addr, to_addrs, msg, mail_options, rcpt_options
+            )
+
+        if isinstance(msg, str):
+            msg = smtplib._fix_eols(msg).encode('ascii')
+        if isinstance(to_addrs, str):
+            to_addrs = [to_addrs]
+
+        esmtp_opts = []
+        if 'size' in self.esmtp_features:
+            esmtp_opts.append("size=%d" % len(msg))
+        esmtp_opts.extend(mail_options)
+
+        # Write the whole envelope without waiting for replies
+        option_str = ''.join(' ' + opt for opt in esmtp_opts)
+        self.putcmd("mail", f"FROM:{smtplib.quoteaddr(from_addr)}{option_str}")
+        rcpt_option_str = ''.join(' ' + opt for opt in rcpt_options)
+        for addr in to_addrs:
+            self.putcmd("rcpt", f"TO:{smtplib.quoteaddr(addr)}{rcpt_option_str}")
+        self.putcmd("data")
+
+        # Now drain all pending replies in order
+        mail_code, mail_resp = self.getreply()
+        rcpt_replies = [self.getreply() for _ in to_addrs]
+        data_code, data_resp = self.getreply()
+
+        if mail_code != 250:
+            if mail_code == 421:
+                self.close()
+            else:
+                self._rset()
+            raise smtplib.SMTPSenderRefused(mail_code, mail_resp, from_addr)
+
+        senderrs = {
+            addr: reply
+            for addr, reply in zip(to_addrs, rcpt_replies)
+            if reply[0] not in (250, 251)
+        }
+        if len(senderrs) == len(to_addrs):
+            self._rset()
+            raise smtplib.SMTPRecipientsRefused(senderrs)
+        if data_code != 354:
+            self._rset()
+            raise smtplib.SMTPDataError(data_code, data_resp)
+
+        # Server accepted DATA - transmit the message body
+        body = smtplib._quote_periods(msg)
+        if not body.endswith(smtplib.bCRLF):
+            body += smtplib.bCRLF
+        body += b"." + smtplib.bCRLF
+        self.send(body)
+        code, resp = self.getreply()
+        if code != 250:
+            if code == 421:
+                self.close()
+            else:
+                self._rset()
+            raise smtplib.SMTPDataError(code, resp)
+
+        return senderrs
+
+    def stream_message(self, from_addr, to_addrs, msg, attachments):
+        """
+        Send a message, streaming large attachments straight to the
+        socket in base64 chunks.
+
+        Flattening a message with a multi-MB attachment copies the
+        payload disk -> bytes -> base64 str -> socket. Here the caller
+        leaves the large files out of `msg`; after DATA is accepted the
+        flattened head is written, then each file is read and encoded
+        in O(chunk) memory directly onto the wire.
+
+        Args:
+            from_addr: Envelope sender
+            to_addrs: Envelope recipients
+            msg: Built message WITHOUT the large attachments
+            attachments: List of (file_path, os.stat_result) pairs
+        """
+        self.ehlo_or_helo_if_needed()
+
+        # Flattening also assigns the multipart boundary if unset
+        flat = msg.as_bytes()
+        boundary = msg.get_boundary().encode('ascii')
+        head = flat[:flat.rfind(b"--" + boundary + b"--")]
+
+        code, resp = self.mail(from_addr)
+        if code != 250:
+            self._rset()
+            raise smtplib.SMTPSenderRefused(code, resp, from_addr)
+        for addr in to_addrs:
+            code, resp = self.rcpt(addr)
+            if code not in (250, 251):
+                self._rset()
+                raise smtplib.SMTPRecipientsRefused({addr: (code, resp)})
+        self.putcmd("data")
+        code, resp = self.getreply()
+        if code != 354:
+            raise smtplib.SMTPDataError(code, resp)
+
+        # Body head (everything up to the closing boundary), dot-stuffed
+        self.send(smtplib._quote_periods(head))
+
+        for file_path, _st in attachments:
+            filename = Path(file_path).name
+            maintype, subtype = 'application', 'octet-stream'
+            guessed, _ = mimetypes.guess_type(filename)
+            if guessed:
+                maintype, subtype = guessed.split('/', 1)
+
+            part_head = (
+                b"--" + boundary + b"\r\n" +
+                f"Content-Type: {maintype}/{subtype}\r\n".encode('ascii') +
+                b"MIME-Version: 1.0\r\n"
+                b"Content-Transfer-Encoding: base64\r\n" +
+                f"Content-Disposition: attachment; filename= {filename}"
+                f"\r\n\r\n".encode('ascii', 'replace')
+            )
+            self.send(part_head)
+
+            # One send per chunk keeps syscall count low while memory
+            # stays O(chunk) no matter how large the file is
+            with open(file_path, 'rb') as f:
+                while chunk := f.read(_B64_CHUNK):
+                    mv = memoryview(chunk)
+                    buf = bytearray()
+                    for i in range(0, len(mv), 57):
+                        buf += b2a_base64(mv[i:i + 57])[:-1] + b"\r\n"
+                    self.send(bytes(buf))
+
+        self.send(b"--" + boundary + b"--\r\n.\r\n")
+        code, resp = self.getreply()
+        if code != 250:
+            raise smtplib.SMTPDataError(code, resp)
+
+
+class _SMTPPool:
+    """
+    Thread-safe pool of pre-authenticated SMTP connections.
+
+    Opening a fresh SMTP connection costs a TCP handshake, a TLS
+    handshake and AUTH on every send - easily a second or more per
+    email. The pool pays that cost once per connection and reuses it
+    across sends, closing connections only when they go idle or after
+    they have carried enough messages to warrant rotation.
+    """
+
+    IDLE_TIMEOUT = 100  # seconds before an idle connection is closed
+
+    def __init__(self, host: str, port: int, user: str, password: str,
+                 pool_size: int, max_msgs_per_conn: int):
+        self.host = host
+        self.port = port
+        self.user = user
+        self.password = password
+        self.max_msgs_per_conn = max_msgs_per_conn
+
+        # Idle connections waiting for reuse: (server, last_used_ts)
+        self._idle: "queue.Queue" = queue.Queue(maxsize=pool_size)
+
+        # Background reaper closes connections idle for too long
+        self._reaper = threading.Thread(
+            target=self._reap_idle, daemon=True, name="smtp-pool-reaper"
+        )
+        self._reaper.start()
+
+    def _new_connection(self) -> smtplib.SMTP:
+        """Build, secure and authenticate a fresh SMTP connection"""
+        smtp_class = PipelinedSMTP if settings.smtp_pipelining else smtplib.SMTP
+        server = smtp_class(self.host, self.port)
+        server.starttls()
+        server.login(self.user, self.password)
+        server._pool_msgs = 0
+
+        # Snapshot the post-TLS EHLO capabilities on the pool entry so
+        # PIPELINING / 8BITMIME / SIZE checks stay O(1) across reuses
+        server._pool_features = dict(server.esmtp_features)
+        server._pool_does_esmtp = server.does_esmtp
+        return server
+
+    def _checkout(self) -> smtplib.SMTP:
+        """Get a healthy connection, reusing an idle one when possible"""
+        while True:
+            try:
+                server, _last_used = self._idle.get_nowait()
+            except queue.Empty:
+                return self._new_connection()
+
+            # Rotate connections that have carried too many messages
+            # before the provider starts rate limiting the session
+            if getattr(server, "_pool_msgs", 0) >= self.max_msgs_per_conn:
+                self._close_quietly(server)
+                continue
+
+            # Health check - stale connections fail here, not mid-send.
+            # NOOP leaves the EHLO state alone, so the capabilities
+            # parsed at connect time are reused without another EHLO
+            # round-trip; restore them if anything cleared the state.
+            try:
+                code, _ = server.noop()
+                if code == 250:
+                    if not server.esmtp_features and getattr(
+                            server, '_pool_features', None):
+                        server.esmtp_features = dict(server._pool_features)
+                        server.does_esmtp = server._pool_does_esmtp
+                    return server
+            except (smtplib.SMTPServerDisconnected, OSError):
+                pass
+
+            self._close_quietly(server)
+
+    def _checkin(self, server: smtplib.SMTP):
+        """Return a connection to the pool, closing it if the pool is full"""
+        try:
+            self._idle.put_nowait((server, time.time()))
+        except queue.Full:
+            self._close_quietly(server)
+
+    @contextmanager
+    def acquire(self):
+        """Check out a connection for the duration of a with-block"""
+        server = self._checkout()
+        try:
+            yield server
+        except Exception:
+            # Connection state is unknown after a failure - drop it
+            self._close_quietly(server)
+            raise
+        else:
+            server._pool_msgs = getattr(server, "_pool_msgs", 0) + 1
+            self._checkin(server)
+
+    def _reap_idle(self):
+        """Close connections that have been idle longer than IDLE_TIMEOUT"""
+        while True:
+            time.sleep(self.IDLE_TIMEOUT / 2)
+            fresh = []
+            while True:
+                try:
+                    server, last_used = self._idle.get_nowait()
+                except queue.Empty:
+                    break
+                if time.time() - last_used > self.IDLE_TIMEOUT:
+                    self._close_quietly(server)
+                else:
+                    fresh.append((server, last_used))
+            for entry in fresh:
+                try:
+                    self._idle.put_nowait(entry)
+                except queue.Full:
+                    self._close_quietly(entry[0])
+
+    def close_all(self):
+        """Close every idle connection (process shutdown)"""
+        while True:
+            try:
+                server, _ = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._close_quietly(server)
+
+    @staticmethod
+    def _close_quietly(server: smtplib.SMTP):
+        try:
+            server.quit()
+        except Exception:
+            try:
+                server.close()
+            except Exception:
+                pass
+
 
 class EmailService:
     """Handles sending emails with attachments"""
@@ -20,6 +383,68 @@ class EmailService:
         self.sender_email = settings.sender_email
         self.sender_name = settings.sender_name
 
+        # Format the static From header once instead of per message
+        self._from_hdr = f"{self.sender_name} <{self.sender_email}>"
+
+        # Skeleton message with the static pieces already in place -
+        # per send it is shallow-copied instead of re-running the
+        # MIMEMultipart constructor's policy and header machinery
+        self._skeleton = MIMEMultipart('alternative', policy=policy.SMTP)
+        self._skeleton['From'] = self._from_hdr
+
+        self._pool = _SMTPPool(
+            host=self.smtp_host,
+            port=self.smtp_port,
+            user=self.smtp_user,
+            password=self.smtp_password,
+            pool_size=settings.smtp_pool_size,
+            max_msgs_per_conn=settings.smtp_max_msgs_per_conn
+        )
+        self._sender = BatchSender(self)
+
+        # Bounded workers for fire-and-forget sends - callers get their
+        # thread back immediately and SMTP latency is hidden behind the
+        # pool without risking a connection storm
+        self._executor = ThreadPoolExecutor(
+            max_workers=settings.email_workers,
+            thread_name_prefix='smtp'
+        )
+        atexit.register(self._executor.shutdown, wait=True)
+
+        # HTML templates are compiled once here; render() per send is a
+        # fast walk over the pre-parsed template instead of rebuilding a
+        # multi-KB f-string literal on every call
+        self._env = Environment(
+            loader=FileSystemLoader(Path(__file__).parent / "templates"),
+            auto_reload=False,
+            autoescape=True
+        )
+        self._tmpl_product = self._env.get_template("product_video.html")
+        self._tmpl_error = self._env.get_template("error.html")
+        self._tmpl_content = self._env.get_template("content.html")
+        self._tmpl_genome = self._env.get_template("genome_report.html")
+
+        # O(1) template selection by kind - extend this dict rather
+        # than growing an if/elif tree as email types multiply
+        self._templates = {
+            'product_video': self._tmpl_product,
+            'error': self._tmpl_error,
+            'content': self._tmpl_content,
+            'genome_report': self._tmpl_genome,
+        }
+
+        # The content shell is 90%+ static per send. Render it once with
+        # sentinel placeholders and split into byte segments; per send
+        # the body is a cheap b"".join over the dynamic values instead
+        # of a full template render.
+        sentinel = "\x00"
+        rendered = self._tmpl_content.render(
+            prompt=sentinel, caption=sentinel, hashtags_str=sentinel
+        )
+        self._content_segs = tuple(
+            seg.encode('utf-8') for seg in rendered.split(sentinel)
+        )
+
     def send_email(
         self,
         to_email: str,
@@ -40,44 +465,276 @@ class EmailService:
             bool: True if email sent successfully
         """
         try:
-            # Create message
-            msg = MIMEMultipart('alternative')
-            msg['From'] = f"{self.sender_name} <{self.sender_email}>"
-            msg['To'] = to_email
-            msg['Subject'] = subject
+            msg = self._build_message(to_email, subject, body_html, attachments)
+
+            # Send over a pooled, already-authenticated connection
+            with self._pool.acquire() as server:
+                self._deliver(server, msg)
+
+            logger.info("Email sent successfully to %s", to_email)
+            return True
+
+        except Exception:
+            logger.exception("Failed to send email to %s", to_email)
+            return False
+
+    def send_email_bulk(
+        self,
+        to_emails: List[str],
+        subject: str,
+        body_html: str,
+        attachments: Optional[List[str]] = None
+    ) -> Dict[str, bool]:
+        """
+        Send the same email to multiple recipients.
+
+        The MIME payload - including base64-encoded attachments - is
+        built once and reused for every recipient, and deliveries share
+        a single pooled SMTP session with RSET between them instead of
+        re-encoding and reconnecting per recipient.
+
+        Args:
+            to_emails: Recipient email addresses
+            subject: Email subject
+            body_html: HTML body content
+            attachments: List of file paths to attach
+
+        Returns:
+            Dict mapping each address to whether its send succeeded
+        """
+        results = {addr: False for addr in to_emails}
+        if not to_emails:
+            return results
+
+        try:
+            msg = self._build_message(to_emails[0], subject, body_html, attachments)
+        except Exception:
+            logger.exception("Failed to build bulk email")
+            return results
+
+        remaining = list(to_emails)
+        # A disconnect mid-DATA leaves remaining[0] unsent, so the
+        # outer loop reconnects and retries it - but only a bounded
+        # number of times. A server that drops the connection on the
+        # same message every time (oversized payload, content filter)
+        # must not become an infinite reconnect-and-resend loop.
+        attempts: Dict[str, int] = {}
+        while remaining:
+            try:
+                with self._pool.acquire() as server:
+                    while remaining:
+                        addr = remaining[0]
+                        msg.replace_header('To', addr)
+                        try:
+                            self._deliver(server, msg)
+                            results[addr] = True
+                            logger.info("Email sent successfully to %s", addr)
+                        except (smtplib.SMTPRecipientsRefused,
+                                smtplib.SMTPDataError) as e:
+                            logger.warning("Failed to send email to %s: %s", addr, e)
+                        remaining.pop(0)
+
+                        if remaining:
+                            code, _ = server.rset()
+                            if code // 100 != 2:
+                                # Some servers treat RSET like QUIT -
+                                # rotate to a fresh connection
+                                raise smtplib.SMTPServerDisconnected(
+                                    f"RSET refused with {code}"
+                                )
+            except smtplib.SMTPServerDisconnected:
+                if remaining:
+                    addr = remaining[0]
+                    attempts[addr] = attempts.get(addr, 0) + 1
+                    if attempts[addr] >= self._MAX_DELIVERY_ATTEMPTS:
+                        logger.warning(
+                            "Giving up on %s after %d disconnects",
+                            addr, attempts[addr]
+                        )
+                        remaining.pop(0)
+                continue
+            except Exception:
+                logger.exception("Bulk send aborted")
+                break
+
+        return results
+
+    def _offload_attachments(self, attachments):
+        """
+        Try to replace attachments with hosted download links.
+
+        When an artifact bucket is configured and every file uploads,
+        the email carries ~1 KB of links instead of 1.33x the file
+        size in base64. Any failure keeps the inline attachments.
+
+        Returns:
+            (attachments, download_links_html)
+        """
+        if not settings.artifact_bucket or not attachments:
+            return attachments, ""
+
+        links = []
+        for file_path in attachments:
+            url = upload_artifact(file_path)
+            if url is None:
+                return attachments, ""
+            name = escape(Path(file_path).name)
+            links.append(
+                f'<p><a style="{_LINK_STYLE}" href="{url}">Download {name}</a></p>'
+            )
+
+        return None, "".join(links)
+
+    def send_email_async(
+        self,
+        to_email: str,
+        subject: str,
+        body_html: str,
+        attachments: Optional[List[str]] = None
+    ) -> Future:
+        """
+        Queue an email on the background workers without blocking.
+
+        Returns:
+            Future resolving to the send_email result; callers that
+            don't care about delivery can simply drop it
+        """
+        return self._executor.submit(
+            self.send_email, to_email, subject, body_html, attachments
+        )
 
-            # Attach HTML body
+    def _build_message(
+        self,
+        to_email: str,
+        subject: str,
+        body_html: Union[str, bytes],
+        attachments: Optional[List[str]] = None
+    ) -> MIMEMultipart:
+        """Build the MIME message for an outbound email"""
+        # Shallow-copy the skeleton (From already set, policy.SMTP so
+        # headers fold with CRLF on flatten); the header and payload
+        # lists must be fresh or copies would alias each other
+        msg = copy.copy(self._skeleton)
+        msg._headers = list(self._skeleton._headers)
+        msg._payload = []
+        msg['To'] = to_email
+        msg['Subject'] = subject
+
+        # Attach HTML body. A bytes body (the pre-joined segment path)
+        # goes straight into the payload as 8bit, skipping the
+        # charset-detection and re-encoding pass MIMEText would run
+        # over every byte of a str body. 8bit bodies are only legal on
+        # servers advertising 8BITMIME - _deliver downgrades the part
+        # when the connection lacks it.
+        if isinstance(body_html, bytes):
+            html_part = MIMEText('', 'html', 'utf-8')
+            del html_part['Content-Transfer-Encoding']
+            html_part['Content-Transfer-Encoding'] = '8bit'
+            html_part.set_payload(body_html)
+        else:
             html_part = MIMEText(body_html, 'html')
-            msg.attach(html_part)
+        msg.attach(html_part)
+
+        # Attach files if provided - one stat per file serves as the
+        # existence check, the size for buffer preallocation, and the
+        # streaming-threshold decision. Oversized files are left out of
+        # the message and streamed to the socket at delivery time.
+        large = []
+        if attachments:
+            for file_path in attachments:
+                try:
+                    st = os.stat(file_path)
+                except FileNotFoundError:
+                    continue
+                if st.st_size > settings.stream_attach_threshold:
+                    large.append((file_path, st))
+                else:
+                    self._attach_file(msg, file_path, st)
+        msg._stream_attachments = large
+
+        return msg
+
+    def _downgrade_8bit(self, msg: MIMEMultipart):
+        """
+        Re-encode an 8bit HTML body part for servers without 8BITMIME.
 
-            # Attach files if provided
-            if attachments:
-                for file_path in attachments:
-                    if os.path.exists(file_path):
-                        self._attach_file(msg, file_path)
+        The templates embed multi-byte characters, and a strict MTA may
+        reject or mangle raw 8-bit data it never agreed to accept; the
+        MIMEText path re-encodes the body as quoted-printable/base64,
+        which any server takes.
+        """
+        payload = msg.get_payload()
+        for i, part in enumerate(payload):
+            if part.get('Content-Transfer-Encoding') == '8bit':
+                body = part.get_payload()
+                if isinstance(body, bytes):
+                    body = body.decode('utf-8')
+                payload[i] = MIMEText(body, 'html', 'utf-8')
+                break
+
+    def _deliver(self, server: smtplib.SMTP, msg: MIMEMultipart):
+        """
+        Send a built message over an open connection, streaming any
+        oversized attachments straight to the socket when the
+        connection supports it.
+        """
+        # The pool's EHLO already cached capabilities, so this is a
+        # dict lookup, not a round trip
+        if not server.has_extn('8bitmime'):
+            self._downgrade_8bit(msg)
 
-            # Connect to SMTP server and send
-            with smtplib.SMTP(self.smtp_host, self.smtp_port) as server:
-                server.starttls()
-                server.login(self.smtp_user, self.smtp_password)
-                server.send_message(msg)
+        large = getattr(msg, '_stream_attachments', None)
+        if large and isinstance(server, PipelinedSMTP):
+            server.stream_message(self.sender_email, [msg['To']], msg, large)
+            return
 
-            print(f"Email sent successfully to {to_email}")
-            return True
+        if large:
+            # Connection can't stream - encode the files inline instead
+            for file_path, st in large:
+                self._attach_file(msg, file_path, st)
+            msg._stream_attachments = []
 
-        except Exception as e:
-            print(f"Failed to send email: {e}")
-            return False
+        server.send_message(msg)
 
-    def _attach_file(self, msg: MIMEMultipart, file_path: str):
-        """Attach a file to the email message"""
+    # Read size is a multiple of 57 bytes so every chunk encodes to
+    # whole 76-char base64 lines and chunks can be concatenated
+    _B64_CHUNK = 57 * 1024
+
+    # How many times a bulk recipient is retried across reconnects
+    # before being marked failed
+    _MAX_DELIVERY_ATTEMPTS = 3
+
+    def _attach_file(self, msg: MIMEMultipart, file_path: str, st: os.stat_result):
+        """
+        Attach a file to the email message.
+
+        The file is base64-encoded in fixed-size chunks instead of being
+        read whole and re-encoded by encoders.encode_base64, so peak
+        memory no longer doubles with attachment size. The caller's
+        stat result sizes the output buffer up front so it never grows.
+        """
         filename = Path(file_path).name
 
-        with open(file_path, 'rb') as f:
-            part = MIMEBase('application', 'octet-stream')
-            part.set_payload(f.read())
+        maintype, subtype = 'application', 'octet-stream'
+        guessed, _ = mimetypes.guess_type(filename)
+        if guessed:
+            maintype, subtype = guessed.split('/', 1)
 
-        encoders.encode_base64(part)
+        # base64 is 4 output bytes per 3 input, plus one newline per
+        # 57-byte line - preallocating avoids growth reallocations
+        approx = ((st.st_size + 2) // 3) * 4 + st.st_size // 57 + 2
+        out = BytesIO(bytes(approx))
+        out.seek(0)
+        with open(file_path, 'rb') as f:
+            while chunk := f.read(self._B64_CHUNK):
+                mv = memoryview(chunk)
+                for i in range(0, len(mv), 57):
+                    out.write(b2a_base64(mv[i:i + 57]))
+        out.truncate()
+
+        part = MIMEBase(maintype, subtype)
+        part.set_payload(out.getvalue().decode('ascii'))
+        part['Content-Transfer-Encoding'] = 'base64'
         part.add_header(
             'Content-Disposition',
             f'attachment; filename= {filename}'
@@ -104,177 +761,45 @@ class EmailService:
         Returns:
             bool: True if sent successfully
         """
-        subject = f"Your {product_name} Marketing Materials Are Ready!"
+        subject, body_html, attachments = self._prep_product_video(
+            product_name, video_path, image_path
+        )
+        return self._sender.submit(to_email, subject, body_html, attachments).result()
 
-        body_html = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <style>
-                body {{
-                    font-family: Arial, sans-serif;
-                    line-height: 1.6;
-                    color: #333;
-                    max-width: 600px;
-                    margin: 0 auto;
-                    padding: 20px;
-                }}
-                .header {{
-                    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                    color: white;
-                    padding: 30px;
-                    text-align: center;
-                    border-radius: 10px 10px 0 0;
-                }}
-                .content {{
-                    background: #f9f9f9;
-                    padding: 30px;
-                    border-radius: 0 0 10px 10px;
-                }}
-                .button {{
-                    display: inline-block;
-                    background: #667eea;
-                    color: white;
-                    padding: 12px 30px;
-                    text-decoration: none;
-                    border-radius: 5px;
-                    margin: 20px 0;
-                }}
-                .footer {{
-                    text-align: center;
-                    margin-top: 30px;
-                    color: #666;
-                    font-size: 12px;
-                }}
-                .feature {{
-                    background: white;
-                    padding: 15px;
-                    margin: 10px 0;
-                    border-left: 4px solid #667eea;
-                    border-radius: 5px;
-                }}
-            </style>
-        </head>
-        <body>
-            <div class="header">
-                <h1>🎉 Your Marketing Materials Are Ready!</h1>
-            </div>
-            <div class="content">
-                <h2>Hello!</h2>
-                <p>Great news! We've successfully processed your product: <strong>{product_name}</strong></p>
-
-                <div class="feature">
-                    <h3>📸 What's Included:</h3>
-                    <ul>
-                        <li><strong>Studio-Quality Product Photo</strong> - Enhanced and professionally edited</li>
-                        <li><strong>Marketing Video</strong> - A high-quality promotional video ready to share</li>
-                    </ul>
-                </div>
-
-                <p>Both files are attached to this email. You can use them immediately for:</p>
-                <ul>
-                    <li>Social media marketing</li>
-                    <li>Your e-commerce website</li>
-                    <li>Email campaigns</li>
-                    <li>Digital advertising</li>
-                </ul>
-
-                <div style="text-align: center; margin: 30px 0;">
-                    <p><strong>Start promoting your product today!</strong></p>
-                </div>
-
-                <div class="feature">
-                    <h3>💡 Tips for Best Results:</h3>
-                    <ul>
-                        <li>Share the video on Instagram Reels and TikTok for maximum reach</li>
-                        <li>Use the enhanced photo as your main product image</li>
-                        <li>Post consistently across multiple platforms</li>
-                    </ul>
-                </div>
-
-                <p>If you have any questions or need additional edits, feel free to upload again or contact our support team.</p>
-
-                <div style="text-align: center;">
-                    <p style="font-size: 18px; color: #667eea;"><strong>Thank you for using Pixaro AI!</strong></p>
-                </div>
-            </div>
-            <div class="footer">
-                <p>This is an automated message from Pixaro AI Agent</p>
-                <p>&copy; 2025 Pixaro. All rights reserved.</p>
-            </div>
-        </body>
-        </html>
-        """
+    def _prep_product_video(self, product_name, video_path, image_path=None):
+        """Build subject, body and attachments for the product video email"""
+        subject = f"Your {product_name} Marketing Materials Are Ready!"
 
-        # Prepare attachments
+        # Prepare attachments - missing files are skipped by the single
+        # stat in _build_message, no need to pre-check here
         attachments = [video_path]
-        if image_path and os.path.exists(image_path):
+        if image_path:
             attachments.append(image_path)
+        attachments, download_links = self._offload_attachments(attachments)
+
+        body_html = self._tmpl_product.render(
+            product_name=product_name, download_links=download_links
+        )
 
-        return self.send_email(to_email, subject, body_html, attachments)
+        return subject, body_html, attachments
 
     def send_error_email(self, to_email: str, product_name: str, error_message: str) -> bool:
         """Send email when processing fails"""
-        # Truncate product_name if too long for subject
-        display_name = product_name[:50] + "..." if len(product_name) > 50 else product_name
+        subject, body_html, attachments = self._prep_error(product_name, error_message)
+        return self._sender.submit(to_email, subject, body_html, attachments).result()
+
+    def _prep_error(self, product_name, error_message):
+        """Build subject and body for the processing failure email"""
+        # Single-expression truncation; the unicode ellipsis is one
+        # char, and autoescaping in the template handles HTML safety
+        display_name = product_name if len(product_name) <= 50 else product_name[:50] + "…"
         subject = f"Issue Processing Your Content"
 
-        body_html = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <style>
-                body {{
-                    font-family: Arial, sans-serif;
-                    line-height: 1.6;
-                    color: #333;
-                    max-width: 600px;
-                    margin: 0 auto;
-                    padding: 20px;
-                }}
-                .header {{
-                    background: #dc3545;
-                    color: white;
-                    padding: 30px;
-                    text-align: center;
-                    border-radius: 10px 10px 0 0;
-                }}
-                .content {{
-                    background: #f9f9f9;
-                    padding: 30px;
-                    border-radius: 0 0 10px 10px;
-                }}
-            </style>
-        </head>
-        <body>
-            <div class="header">
-                <h1>⚠️ Processing Issue</h1>
-            </div>
-            <div class="content">
-                <h2>Hello!</h2>
-                <p>We encountered an issue while generating your content.</p>
-
-                <p><strong>Your Prompt:</strong></p>
-                <p style="background: #f8f9ff; padding: 15px; border-radius: 5px; font-style: italic; border-left: 4px solid #667eea;">
-                    {display_name}
-                </p>
-
-                <p><strong>Error Details:</strong></p>
-                <p style="background: #fff3cd; padding: 15px; border-radius: 5px; font-family: monospace; font-size: 13px; color: #856404;">
-                    {error_message}
-                </p>
-
-                <p>Please try again with a different prompt. If the issue persists, contact our support team.</p>
-
-                <p>We apologize for the inconvenience.</p>
-
-                <p><strong>Best regards,</strong><br>Pixaro AI Team</p>
-            </div>
-        </body>
-        </html>
-        """
+        body_html = self._tmpl_error.render(
+            display_name=display_name, error_message=error_message
+        )
 
-        return self.send_email(to_email, subject, body_html)
+        return subject, body_html, None
 
     def send_content_email(
         self,
@@ -299,153 +824,39 @@ class EmailService:
         Returns:
             bool: True if sent successfully
         """
+        subject, body_html, attachments = self._prep_content(
+            prompt, image_path, video_path, caption, hashtags
+        )
+        return self._sender.submit(to_email, subject, body_html, attachments).result()
+
+    def _prep_content(self, prompt, image_path, video_path, caption, hashtags):
+        """Build subject, body and attachments for the content email"""
         subject = "Your AI-Generated Content is Ready!"
 
-        hashtags_str = " ".join(hashtags)
-
-        body_html = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <style>
-                body {{
-                    font-family: Arial, sans-serif;
-                    line-height: 1.6;
-                    color: #333;
-                    max-width: 600px;
-                    margin: 0 auto;
-                    padding: 20px;
-                }}
-                .header {{
-                    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                    color: white;
-                    padding: 30px;
-                    text-align: center;
-                    border-radius: 10px 10px 0 0;
-                }}
-                .content {{
-                    background: #f9f9f9;
-                    padding: 30px;
-                    border-radius: 0 0 10px 10px;
-                }}
-                .prompt-box {{
-                    background: white;
-                    padding: 15px;
-                    border-left: 4px solid #667eea;
-                    border-radius: 5px;
-                    margin: 20px 0;
-                    font-style: italic;
-                }}
-                .caption-box {{
-                    background: #f0f8ff;
-                    padding: 20px;
-                    border-radius: 8px;
-                    margin: 20px 0;
-                    border: 2px solid #667eea;
-                }}
-                .hashtags {{
-                    background: #fff;
-                    padding: 15px;
-                    border-radius: 8px;
-                    margin: 15px 0;
-                    color: #667eea;
-                    font-weight: bold;
-                }}
-                .feature {{
-                    background: white;
-                    padding: 15px;
-                    margin: 10px 0;
-                    border-left: 4px solid #28a745;
-                    border-radius: 5px;
-                }}
-                .footer {{
-                    text-align: center;
-                    margin-top: 30px;
-                    color: #666;
-                    font-size: 12px;
-                }}
-            </style>
-        </head>
-        <body>
-            <div class="header">
-                <h1>✨ Your Content is Ready!</h1>
-                <p style="margin: 0; font-size: 18px;">AI-Generated Social Media Package</p>
-            </div>
-            <div class="content">
-                <h2>Hello!</h2>
-                <p>Amazing news! Your AI-generated content is ready to go viral! 🚀</p>
-
-                <div class="prompt-box">
-                    <strong>Your Prompt:</strong><br>
-                    "{prompt}"
-                </div>
-
-                <div class="feature">
-                    <h3>📦 What's Included:</h3>
-                    <ul>
-                        <li>✅ <strong>AI-Generated Image</strong> (DALL-E 3) - Professional quality</li>
-                        <li>✅ <strong>Cinema-Quality Video</strong> (Veo 3) - 10 seconds of pure awesomeness</li>
-                        <li>✅ <strong>Engaging Caption</strong> - Written by GPT-4</li>
-                        <li>✅ <strong>Trending Hashtags</strong> - Optimized for reach</li>
-                    </ul>
-                </div>
-
-                <div class="caption-box">
-                    <h3 style="margin-top: 0; color: #667eea;">📝 Your Caption:</h3>
-                    <p style="font-size: 16px; line-height: 1.8;">{caption}</p>
-                </div>
-
-                <div class="hashtags">
-                    <h3 style="margin-top: 0;">📱 Trending Hashtags:</h3>
-                    <p style="font-size: 14px; margin: 10px 0;">{hashtags_str}</p>
-                </div>
-
-                <div class="feature">
-                    <h3>🚀 How to Use:</h3>
-                    <ol>
-                        <li>Download the attached image and video</li>
-                        <li>Post on Instagram, TikTok, or YouTube Shorts</li>
-                        <li>Copy-paste the caption</li>
-                        <li>Add the hashtags</li>
-                        <li>Watch your engagement soar! 📈</li>
-                    </ol>
-                </div>
-
-                <div class="feature">
-                    <h3>💡 Pro Tips:</h3>
-                    <ul>
-                        <li><strong>Best times to post:</strong> 9 AM, 12 PM, or 7 PM (local time)</li>
-                        <li><strong>Instagram:</strong> Use Reels for maximum reach</li>
-                        <li><strong>TikTok:</strong> Add trending sounds for viral potential</li>
-                        <li><strong>Cross-post:</strong> Share on multiple platforms simultaneously</li>
-                    </ul>
-                </div>
-
-                <div style="text-align: center; margin: 30px 0;">
-                    <p style="font-size: 20px; color: #667eea;"><strong>Ready to Go Viral! 🔥</strong></p>
-                </div>
-
-                <p>Need more content? Just send another prompt!</p>
-
-                <div style="text-align: center; margin-top: 20px;">
-                    <p style="font-size: 18px; color: #667eea;"><strong>Thank you for using Pixaro AI!</strong></p>
-                </div>
-            </div>
-            <div class="footer">
-                <p>This is an automated message from Pixaro AI Content Generator</p>
-                <p>&copy; 2025 Pixaro. All rights reserved.</p>
-                <p style="margin-top: 10px; color: #999;">
-                    Image: DALL-E 3 | Video: Veo 3 | Caption: GPT-4
-                </p>
-            </div>
-        </body>
-        </html>
-        """
+        hashtags_str = _join_hashtags(tuple(hashtags))
 
         # Attach both files
         attachments = [image_path, video_path]
-
-        return self.send_email(to_email, subject, body_html, attachments)
+        attachments, download_links = self._offload_attachments(attachments)
+
+        if download_links:
+            # Hosted-link emails need the full template render
+            body_html = self._tmpl_content.render(
+                prompt=prompt, caption=caption, hashtags_str=hashtags_str,
+                download_links=download_links
+            )
+            return subject, body_html, attachments
+
+        # Join the pre-rendered shell segments around the escaped
+        # dynamic values (shell order: prompt, caption, hashtags)
+        body_html = b"".join([
+            self._content_segs[0], escape(prompt).encode('utf-8'),
+            self._content_segs[1], escape(caption).encode('utf-8'),
+            self._content_segs[2], escape(hashtags_str).encode('utf-8'),
+            self._content_segs[3],
+        ])
+
+        return subject, body_html, attachments
 
     def send_genome_report_email(
         self,
@@ -464,198 +875,215 @@ class EmailService:
         Returns:
             bool: True if sent successfully
         """
-        subject = f"🧬 Your Marketing Genome Report is Ready - {brand_input}"
+        subject, body_html, attachments = self._prep_genome_report(brand_input, report_path)
+        return self._sender.submit(to_email, subject, body_html, attachments).result()
 
-        body_html = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <style>
-                body {{
-                    font-family: Arial, sans-serif;
-                    line-height: 1.6;
-                    color: #333;
-                    max-width: 600px;
-                    margin: 0 auto;
-                    padding: 20px;
-                }}
-                .header {{
-                    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                    color: white;
-                    padding: 40px;
-                    text-align: center;
-                    border-radius: 10px 10px 0 0;
-                }}
-                .content {{
-                    background: #f9f9f9;
-                    padding: 30px;
-                    border-radius: 0 0 10px 10px;
-                }}
-                .brand-box {{
-                    background: white;
-                    padding: 20px;
-                    border-left: 5px solid #667eea;
-                    border-radius: 5px;
-                    margin: 20px 0;
-                    font-size: 18px;
-                }}
-                .feature {{
-                    background: white;
-                    padding: 20px;
-                    margin: 15px 0;
-                    border-radius: 8px;
-                    box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-                }}
-                .feature h3 {{
-                    color: #667eea;
-                    margin-top: 0;
-                }}
-                .highlight-box {{
-                    background: linear-gradient(135deg, #f5f7fa 0%, #e8eaf6 100%);
-                    padding: 20px;
-                    border-radius: 10px;
-                    margin: 20px 0;
-                    border: 2px solid #667eea;
-                }}
-                .cta-button {{
-                    display: inline-block;
-                    background: #667eea;
-                    color: white;
-                    padding: 15px 30px;
-                    text-decoration: none;
-                    border-radius: 5px;
-                    font-weight: bold;
-                    margin: 20px 0;
-                }}
-                .footer {{
-                    text-align: center;
-                    margin-top: 30px;
-                    color: #666;
-                    font-size: 12px;
-                }}
-                .emoji {{
-                    font-size: 24px;
-                }}
-            </style>
-        </head>
-        <body>
-            <div class="header">
-                <h1 style="margin: 0; font-size: 32px;">🧬 Marketing Genome Report</h1>
-                <p style="margin: 10px 0 0 0; font-size: 18px;">Your Complete Marketing DNA Analysis</p>
-            </div>
-            <div class="content">
-                <h2>Hello!</h2>
-                <p style="font-size: 16px;">Your comprehensive Marketing Genome Report is ready! We've analyzed your brand from every angle using real-time data and AI intelligence.</p>
-
-                <div class="brand-box">
-                    <strong>Brand Analyzed:</strong><br>
-                    <span style="color: #667eea; font-size: 20px;">{brand_input}</span>
-                </div>
-
-                <div class="highlight-box">
-                    <h3 style="text-align: center; color: #667eea; margin-top: 0;">📊 What's Inside Your Report</h3>
-                    <p style="text-align: center; margin: 0;">Your complete marketing strategy blueprint</p>
-                </div>
-
-                <div class="feature">
-                    <h3><span class="emoji">🔬</span> Brand DNA Analysis</h3>
-                    <ul>
-                        <li><strong>Brand Personality:</strong> Tone, voice, and style breakdown</li>
-                        <li><strong>Target Audience:</strong> Detailed demographic profile</li>
-                        <li><strong>Core Values:</strong> What your brand truly stands for</li>
-                        <li><strong>Market Positioning:</strong> Where you fit in the landscape</li>
-                    </ul>
-                </div>
-
-                <div class="feature">
-                    <h3><span class="emoji">🎯</span> Competitive Intelligence</h3>
-                    <ul>
-                        <li><strong>Market Landscape:</strong> Who you're up against</li>
-                        <li><strong>Key Competitors:</strong> Detailed competitor profiles</li>
-                        <li><strong>Your Advantages:</strong> What sets you apart</li>
-                        <li><strong>Weaknesses to Exploit:</strong> Gaps in competitor strategies</li>
-                    </ul>
-                </div>
-
-                <div class="feature">
-                    <h3><span class="emoji">📈</span> 90-Day Growth Roadmap</h3>
-                    <ul>
-                        <li><strong>Month 1:</strong> Foundation building strategies</li>
-                        <li><strong>Month 2:</strong> Acceleration tactics</li>
-                        <li><strong>Month 3:</strong> Optimization and scaling</li>
-                        <li><strong>Key Metrics:</strong> KPIs to track your success</li>
-                    </ul>
-                </div>
-
-                <div class="feature">
-                    <h3><span class="emoji">📱</span> Content Strategy Blueprint</h3>
-                    <ul>
-                        <li><strong>Content Pillars:</strong> Core themes for your brand</li>
-                        <li><strong>Content Mix:</strong> Optimal distribution across formats</li>
-                        <li><strong>Publishing Frequency:</strong> Platform-specific schedules</li>
-                        <li><strong>Monthly Themes:</strong> Strategic content calendar</li>
-                    </ul>
-                </div>
-
-                <div class="highlight-box">
-                    <h3 style="color: #667eea; margin-top: 0; text-align: center;">🚀 Ready to Transform Your Marketing?</h3>
-                    <p style="text-align: center;">Your complete Marketing Genome Report is attached as a PDF. Download it now and start implementing your personalized strategy!</p>
-                    <div style="text-align: center;">
-                        <p style="font-size: 14px; color: #666; margin-top: 15px;">📎 <strong>Attachment:</strong> MarketingGenome_Report.pdf</p>
-                    </div>
-                </div>
-
-                <div class="feature">
-                    <h3>💡 How to Use This Report</h3>
-                    <ol>
-                        <li><strong>Read the Executive Summary</strong> - Get the big picture first</li>
-                        <li><strong>Review Your Brand DNA</strong> - Understand your unique identity</li>
-                        <li><strong>Study Competitor Analysis</strong> - Find opportunities to win</li>
-                        <li><strong>Follow the 90-Day Roadmap</strong> - Take action month by month</li>
-                        <li><strong>Implement Content Strategy</strong> - Start creating with purpose</li>
-                    </ol>
-                </div>
-
-                <div class="feature" style="background: #fff3e0; border-left: 5px solid #ff9800;">
-                    <h3 style="color: #f57c00;">🎁 What Makes This Different?</h3>
-                    <p>Unlike generic marketing advice, your Marketing Genome Report is built from <strong>real data</strong> about your brand:</p>
-                    <ul>
-                        <li>✅ Live social media analysis</li>
-                        <li>✅ Website content scraping</li>
-                        <li>✅ Competitor intelligence</li>
-                        <li>✅ Market positioning research</li>
-                        <li>✅ AI-powered strategic insights</li>
-                    </ul>
-                    <p style="margin-bottom: 0;"><strong>This is YOUR unique marketing DNA</strong> - not a template.</p>
-                </div>
-
-                <div style="text-align: center; margin: 40px 0;">
-                    <p style="font-size: 22px; color: #667eea; margin: 0;"><strong>Your Marketing Evolution Starts Now</strong>
-                    <p style="color: #666; margin: 10px 0;">Open the PDF and discover your brand's true potential</p>
-                </div>
-
-                <div style="background: #e8f5e9; padding: 20px; border-radius: 8px; border-left: 5px solid #4caf50;">
-                    <p style="margin: 0; color: #2e7d32;"><strong>💬 Questions or Need Clarification?</strong></p>
-                    <p style="margin: 10px 0 0 0; color: #333;">Review the report and reach out if you need help implementing any strategies. We're here to help you succeed!</p>
-                </div>
-
-                <div style="text-align: center; margin-top: 30px;">
-                    <p style="font-size: 20px; color: #667eea;"><strong>Thank you for using Pixaro Market Genome!</strong></p>
-                    <p style="color: #666;">Powered by AI • Built from Real Data • Designed for Growth</p>
-                </div>
-            </div>
-            <div class="footer">
-                <p>This is an automated message from Pixaro Market Genome AI</p>
-                <p>&copy; 2025 Pixaro. All rights reserved.</p>
-                <p style="margin-top: 10px; color: #999;">
-                    🧬 Marketing Genome Technology | AI-Powered Brand Intelligence
-                </p>
-            </div>
-        </body>
-        </html>
-        """
+    def _prep_genome_report(self, brand_input, report_path):
+        """Build subject, body and attachments for the genome report email"""
+        subject = f"🧬 Your Marketing Genome Report is Ready - {brand_input}"
 
         # Attach PDF report
         attachments = [report_path]
+        attachments, download_links = self._offload_attachments(attachments)
+
+        body_html = self._tmpl_genome.render(
+            brand_input=brand_input, download_links=download_links
+        )
+
+        return subject, body_html, attachments
+
+class AsyncEmailService(EmailService):
+    """
+    Async variant of EmailService built on aiosmtplib.
+
+    The sync service blocks its calling thread on socket I/O for the
+    full TLS handshake + AUTH + DATA. Here the event loop keeps
+    servicing other requests while the SMTP socket waits, and
+    connections are pooled on an asyncio.Queue. FastAPI endpoints call
+    `await email_service.send_*_email(...)`; the sync EmailService
+    stays available for legacy callers.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._async_idle: "asyncio.Queue" = asyncio.Queue(
+            maxsize=settings.smtp_pool_size
+        )
+        # Strong references to fire-and-forget send tasks - the loop
+        # only holds weak ones, so an unreferenced task can be GC'd
+        # mid-send
+        self._bg_tasks: set = set()
+
+    async def _acquire_async(self):
+        """Get a healthy async connection, reusing an idle one when possible"""
+        import aiosmtplib
+
+        while True:
+            try:
+                smtp = self._async_idle.get_nowait()
+            except asyncio.QueueEmpty:
+                break
+
+            # Health check - stale connections fail here, not mid-send
+            try:
+                response = await smtp.noop()
+                if response.code == 250:
+                    return smtp
+            except Exception:
+                pass
+            try:
+                smtp.close()
+            except Exception:
+                pass
+
+        smtp = aiosmtplib.SMTP(
+            hostname=self.smtp_host,
+            port=self.smtp_port,
+            start_tls=True
+        )
+        await smtp.connect()
+        await smtp.login(self.smtp_user, self.smtp_password)
+        return smtp
 
-        return self.send_email(to_email, subject, body_html, attachments)
+    def _release_async(self, smtp):
+        """Return a connection to the pool, closing it if the pool is full"""
+        try:
+            self._async_idle.put_nowait(smtp)
+        except asyncio.QueueFull:
+            try:
+                smtp.close()
+            except Exception:
+                pass
+
+    async def send_email(
+        self,
+        to_email: str,
+        subject: str,
+        body_html: str,
+        attachments: Optional[List[str]] = None
+    ) -> bool:
+        """
+        Send email with optional attachments without blocking the loop
+
+        Args:
+            to_email: Recipient email address
+            subject: Email subject
+            body_html: HTML body content
+            attachments: List of file paths to attach
+
+        Returns:
+            bool: True if email sent successfully
+        """
+        try:
+            # Message assembly reads attachment files off disk and
+            # base64-encodes them - CPU and disk work that would stall
+            # the loop for large files, so it runs in a worker thread
+            msg = await asyncio.to_thread(
+                self._build_message_inline, to_email, subject, body_html, attachments
+            )
+
+            smtp = await self._acquire_async()
+            if not smtp.supports_extension('8bitmime'):
+                self._downgrade_8bit(msg)
+            try:
+                await smtp.send_message(msg)
+            except Exception:
+                try:
+                    smtp.close()
+                except Exception:
+                    pass
+                raise
+            else:
+                self._release_async(smtp)
+
+            logger.info("Email sent successfully to %s", to_email)
+            return True
+
+        except Exception:
+            logger.exception("Failed to send email to %s", to_email)
+            return False
+
+    def _build_message_inline(self, to_email, subject, body_html, attachments):
+        """Build the message with every attachment encoded inline.
+
+        aiosmtplib has no socket-streaming hook, so oversized
+        attachments that the sync path would stream are base64-encoded
+        into the payload here instead.
+        """
+        msg = self._build_message(to_email, subject, body_html, attachments)
+        large = getattr(msg, '_stream_attachments', None)
+        if large:
+            for file_path, st in large:
+                self._attach_file(msg, file_path, st)
+            msg._stream_attachments = []
+        return msg
+
+    def send_email_async(
+        self,
+        to_email: str,
+        subject: str,
+        body_html: str,
+        attachments: Optional[List[str]] = None
+    ) -> "asyncio.Task":
+        """
+        Queue an email without blocking, async-service edition.
+
+        The base-class version submits send_email to the thread pool,
+        but here send_email is a coroutine function - a pool worker
+        would just get an unawaited coroutine back and nothing would be
+        sent. Schedule it as a task on the running loop instead,
+        keeping a strong reference until it finishes.
+        """
+        task = asyncio.get_running_loop().create_task(
+            self.send_email(to_email, subject, body_html, attachments)
+        )
+        self._bg_tasks.add(task)
+        task.add_done_callback(self._bg_tasks.discard)
+        return task
+
+    async def send_product_video_email(
+        self,
+        to_email: str,
+        product_name: str,
+        video_path: str,
+        image_path: Optional[str] = None
+    ) -> bool:
+        """Async version of EmailService.send_product_video_email"""
+        # _prep_* may upload attachments to S3 (blocking network I/O) -
+        # keep it off the loop
+        subject, body_html, attachments = await asyncio.to_thread(
+            self._prep_product_video, product_name, video_path, image_path
+        )
+        return await self.send_email(to_email, subject, body_html, attachments)
+
+    async def send_error_email(self, to_email: str, product_name: str, error_message: str) -> bool:
+        """Async version of EmailService.send_error_email"""
+        subject, body_html, attachments = self._prep_error(product_name, error_message)
+        return await self.send_email(to_email, subject, body_html, attachments)
+
+    async def send_content_email(
+        self,
+        to_email: str,
+        prompt: str,
+        image_path: str,
+        video_path: str,
+        caption: str,
+        hashtags: List[str]
+    ) -> bool:
+        """Async version of EmailService.send_content_email"""
+        subject, body_html, attachments = await asyncio.to_thread(
+            self._prep_content, prompt, image_path, video_path, caption, hashtags
+        )
+        return await self.send_email(to_email, subject, body_html, attachments)
+
+    async def send_genome_report_email(
+        self,
+        to_email: str,
+        brand_input: str,
+        report_path: str
+    ) -> bool:
+        """Async version of EmailService.send_genome_report_email"""
+        subject, body_html, attachments = await asyncio.to_thread(
+            self._prep_genome_report, brand_input, report_path
+        )
+        return await self.send_email(to_email, subject, body_html, attachments)
@@ -3,24 +3,47 @@ Market Genome - AI Marketing Strategy Builder
 Analyzes brands from real data and creates complete marketing DNA
 """
 
-from fastapi import FastAPI, Form, HTTPException, BackgroundTasks, Request
+from fastapi import FastAPI, Form, HTTPException, BackgroundTasks, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, ORJSONResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
+import asyncio
+import concurrent.futures
+import logging
 import os
-import uuid
+import orjson
+import time
+
+# Rust-backed drop-in for the stdlib uuid module - uuid4() is roughly an
+# order of magnitude cheaper, and IDs are minted on every request
+try:
+    import uuid_utils as uuid
+except ImportError:
+    import uuid
 from typing import Dict, Optional
 from pydantic import EmailStr, BaseModel
 from datetime import datetime
+from collections import defaultdict, deque
+from dataclasses import dataclass
+from functools import lru_cache
+
+from cachetools import TTLCache
 
 from config import settings, ensure_directories
 from models import JobStatus
+from brand_ai_assistant import PixaroBrandAssistant, close_shared_client
+
+# Per-message chat traffic logs go through here rather than print() so
+# formatting is skipped entirely when the level is off and the actual
+# write happens on the queue listener thread, not the event loop
+_chat_log = logging.getLogger("chat")
 
 # Create FastAPI app
 app = FastAPI(
     title="Market Genome - AI Marketing Strategy Builder",
     description="Analyze any brand and get a complete Marketing Genome Report",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
 # Enable CORS
@@ -32,14 +55,159 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# In-memory job storage
-genome_jobs: Dict[str, dict] = {}
+# PDF/chart rendering is CPU-bound; running it in worker processes
+# keeps the event loop free and spreads concurrent reports across cores
+_pdf_pool = concurrent.futures.ProcessPoolExecutor(max_workers=os.cpu_count())
+
+# Job storage - Redis when reachable (shared across workers, survives
+# restarts, 24h TTL), with an in-memory fallback for single-process runs
+JOB_TTL = 86400
+
+_redis = None
+
+# Secondary index: lowercased brand input -> recent job IDs, newest at
+# the tail. Lets chat init find a brand's completed analysis with one
+# dict get instead of scanning every historical job
+_jobs_by_brand: Dict[str, deque] = defaultdict(lambda: deque(maxlen=20))
+
+# Report coalescer: while a brand's report pipeline is running, further
+# requests for the same brand join the in-flight job (their email is
+# added to its notification list) instead of launching a duplicate
+# scrape-and-analyze run. Maps lowered brand input -> job_id
+_inflight_reports: Dict[str, str] = {}
+_inflight_reports_lock = asyncio.Lock()
+
+# Fallback job storage when Redis is unavailable. TTLCache is a
+# MutableMapping, so it drops straight in for the plain dict while
+# evicting stale entries instead of growing until the worker OOMs
+genome_jobs: TTLCache = TTLCache(maxsize=10_000, ttl=JOB_TTL)
+
+# Strong references to fire-and-forget tasks. The event loop keeps
+# only weak references, so an analysis pipeline or maintenance loop
+# whose task object is dropped can be garbage-collected mid-run and
+# vanish without a traceback
+_background_tasks: set = set()
+
+
+def _spawn(coro) -> asyncio.Task:
+    """create_task with a strong reference held until completion"""
+    task = asyncio.create_task(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+    return task
+
+
+# Sessions-listing snapshot: the /api/chat/sessions payload is rebuilt
+# only after something actually changes (init, message, end, eviction),
+# so dashboards polling it between chat activity hit a cached dict
+_sessions_snapshot: Optional[dict] = None
+_sessions_dirty = True
+
+
+def _mark_sessions_dirty():
+    global _sessions_dirty
+    _sessions_dirty = True
+
 
-# In-memory chat session storage
-chat_sessions: Dict[str, dict] = {}
+class _ExportingTTLCache(TTLCache):
+    """TTLCache that exports a session's conversation before dropping it"""
+
+    def _export(self, session_id, session):
+        assistant = session.assistant
+        if assistant is None:
+            return
+        try:
+            assistant.export_conversation()
+        except Exception as e:
+            print(f"WARN - Failed to export evicted session {session_id[:8]}: {e}")
+
+    def popitem(self):
+        session_id, session = super().popitem()
+        self._export(session_id, session)
+        _mark_sessions_dirty()
+        return session_id, session
+
+    def expire(self, time=None):
+        expired = super().expire(time)
+        for session_id, session in expired:
+            self._export(session_id, session)
+        if expired:
+            _mark_sessions_dirty()
+        return expired
+
+
+# Chat-init stampede protection: double-clicks and client retries fire
+# several inits for the same brand at once, each building an assistant
+# (context load + prompt assembly). Concurrent inits serialize on a
+# per-brand lock, and a session created moments ago is handed back
+# instead of constructing a duplicate. Both maps are TTL-bounded -
+# brand handles are user-supplied input, so plain dicts would grow one
+# entry per distinct handle forever. Locks only matter while an init is
+# in flight, and reuse entries only within the grace window.
+_INIT_REUSE_WINDOW = 5.0  # seconds
+_brand_init_locks: TTLCache = TTLCache(maxsize=10_000, ttl=300)
+_last_session_by_brand: TTLCache = TTLCache(maxsize=10_000, ttl=_INIT_REUSE_WINDOW)
+
+@dataclass(slots=True)
+class ChatSession:
+    """A live chat session: one assistant plus bookkeeping timestamps.
+
+    Slots keep per-session overhead to a fixed handful of references
+    instead of a dict with its hash table, which adds up at thousands
+    of idle sessions, and typos on field names fail loudly.
+    """
+    session_id: str
+    brand_handle: str
+    assistant: PixaroBrandAssistant
+    created_at: float
+    last_activity: float
+    # Bumped on every completed turn; get_chat_history uses it as a
+    # weak ETag so unchanged conversations revalidate with a 304
+    version: int = 0
+
+
+# In-memory chat session storage. Sessions hold live assistant objects
+# (conversation state + API client) that cannot be serialized to Redis,
+# so they stay process-local; session *metadata* is mirrored to Redis
+# (see _save_session_meta) so other workers can rehydrate a session on
+# demand. Idle sessions expire after an hour, and evicted conversations
+# are exported rather than silently lost
+chat_sessions: TTLCache = _ExportingTTLCache(maxsize=10_000, ttl=3600)
 
 ensure_directories()
 
+# Serve generated assets (e.g. locally cached DALL-E images) from disk
+app.mount("/outputs", StaticFiles(directory=settings.output_dir), name="outputs")
+
+
+# Constant body of the chat welcome message - only the brand handle
+# varies, so the template is built once and formatted (and memoized,
+# since brands repeat) per init instead of re-allocating the f-string
+_WELCOME_TEMPLATE = """Hi! I'm your personal AI strategist for **{}**.
+
+I can help you with:
+- Content creation (Instagram posts, captions, campaigns)
+- Audience insights and personas
+- Competitor analysis
+- Growth strategies
+- Engagement predictions
+- Weekly content planning
+
+What would you like to work on today?"""
+
+
+@lru_cache(maxsize=1024)
+def _welcome_message(brand_handle: str) -> str:
+    """Formatted welcome message for a brand"""
+    return _WELCOME_TEMPLATE.format(brand_handle)
+
+
+def _iso(ts) -> Optional[str]:
+    """Format a stored epoch timestamp for API responses"""
+    if ts is None:
+        return None
+    return datetime.fromtimestamp(ts).isoformat()
+
 
 # Pydantic models for chat
 class ChatInitRequest(BaseModel):
@@ -56,9 +224,294 @@ class ChatReportRequest(BaseModel):
     email: str
 
 
+async def _report_store_sizes():
+    """Periodically log in-memory store sizes for observability"""
+    while True:
+        await asyncio.sleep(300)
+        print(f"Store sizes: jobs={len(genome_jobs)} chat_sessions={len(chat_sessions)}")
+
+
+async def _expire_chat_sessions():
+    """Sweep idle chat sessions so their conversations export promptly"""
+    while True:
+        await asyncio.sleep(60)
+        try:
+            chat_sessions.expire()
+        except Exception as e:
+            print(f"WARN - Session sweep failed: {e}")
+
+
+async def _init_job_store():
+    """Connect the job store to Redis, falling back to in-memory"""
+    global _redis
+
+    try:
+        import redis.asyncio as aioredis
+
+        client = aioredis.from_url(settings.redis_url, decode_responses=True)
+        await client.ping()
+        _redis = client
+        print("Job store: Redis")
+    except Exception as e:
+        _redis = None
+        print(f"Job store: in-memory (Redis unavailable: {e})")
+
+
+async def _save_job(job: dict):
+    """Persist a job's current state"""
+    brand = (job.get('brand_input') or '').lower()
+    if brand:
+        index = _jobs_by_brand[brand]
+        if job['job_id'] not in index:
+            index.append(job['job_id'])
+
+    if _redis is not None:
+        await _redis.set(f"job:{job['job_id']}", orjson.dumps(job).decode(), ex=JOB_TTL)
+    else:
+        genome_jobs[job['job_id']] = job
+
+
+async def _load_job(job_id: str) -> Optional[dict]:
+    """Fetch a job by ID, or None if unknown/expired"""
+    if _redis is not None:
+        raw = await _redis.get(f"job:{job_id}")
+        return orjson.loads(raw) if raw else None
+    return genome_jobs.get(job_id)
+
+
+# Chat session metadata mirrors to Redis so any worker can serve a
+# session that another worker initialized. Only the metadata travels -
+# the assistant holds live Python state (conversation, API client) and
+# stays in each process's chat_sessions cache, rebuilt on first touch
+_SESSION_META_TTL = 3600  # matches the local cache TTL
+
+
+async def _save_session_meta(session: ChatSession):
+    """Persist session metadata, refreshing its expiry"""
+    if _redis is None:
+        return
+    try:
+        key = f"chat:{session.session_id}"
+        await _redis.hset(key, mapping={
+            'session_id': session.session_id,
+            'brand_handle': session.brand_handle,
+            'created_at': session.created_at,
+            'last_activity': session.last_activity,
+            'version': session.version,
+        })
+        await _redis.expire(key, _SESSION_META_TTL)
+    except Exception as e:
+        print(f"WARN - Failed to persist session metadata: {e}")
+
+
+async def _delete_session_meta(session_id: str):
+    """Drop a session's persisted metadata on explicit end"""
+    if _redis is None:
+        return
+    try:
+        await _redis.delete(f"chat:{session_id}")
+    except Exception as e:
+        print(f"WARN - Failed to delete session metadata: {e}")
+
+
+async def _load_brand_context(brand_key: str) -> Optional[dict]:
+    """Pull brand context from this brand's most recent completed job"""
+    for job_id in reversed(_jobs_by_brand.get(brand_key, ())):
+        job = await _load_job(job_id)
+        if job and job.get('status') == JobStatus.COMPLETED:
+            return {
+                'brand_dna': job.get('brand_dna', {}),
+                'audience': job.get('audience', {}),
+                'competitors': job.get('competitors', {})
+            }
+    return None
+
+
+async def _get_session(session_id: str) -> Optional[ChatSession]:
+    """Return the live session, rehydrating from Redis on a local miss.
+
+    A session initialized by another worker exists here only as Redis
+    metadata; rebuild its assistant from the persisted brand handle so
+    the conversation continues (minus this worker's missing history).
+    """
+    if (session := chat_sessions.get(session_id)) is not None:
+        return session
+
+    if _redis is None:
+        return None
+    try:
+        meta = await _redis.hgetall(f"chat:{session_id}")
+    except Exception as e:
+        print(f"WARN - Session metadata lookup failed: {e}")
+        return None
+    if not meta:
+        return None
+
+    brand_handle = meta.get('brand_handle', '')
+    session = ChatSession(
+        session_id=session_id,
+        brand_handle=brand_handle,
+        assistant=PixaroBrandAssistant(
+            brand_handle=brand_handle,
+            brand_context=await _load_brand_context(brand_handle.lower())
+        ),
+        created_at=float(meta.get('created_at', time.time())),
+        last_activity=time.time(),
+        version=int(meta.get('version', 0))
+    )
+    chat_sessions[session_id] = session
+    _mark_sessions_dirty()
+    return session
+
+
+async def _all_jobs() -> list:
+    """List every stored job"""
+    if _redis is not None:
+        jobs = []
+        async for key in _redis.scan_iter(match="job:*"):
+            raw = await _redis.get(key)
+            if raw:
+                jobs.append(orjson.loads(raw))
+        return jobs
+    return list(genome_jobs.values())
+
+
+# Shared per-process service singletons, created at startup. Building
+# these per job re-constructed the OpenAI client (and its whole httpx
+# connection pool) every time; sharing them lets all concurrent jobs
+# reuse warm TLS connections to the APIs
+_engine = None
+_email = None
+
+
+def _init_services():
+    global _engine, _email
+
+    try:
+        from market_genome_engine import MarketGenomeEngine
+        from email_service import AsyncEmailService
+
+        _engine = MarketGenomeEngine()
+        _email = AsyncEmailService()
+        print("Shared engine and email service initialized")
+    except Exception as e:
+        # Jobs fall back to per-task construction (and surface the error
+        # there) so startup never hard-fails on missing configuration
+        print(f"Warning: could not pre-warm services: {e}")
+
+
+# Semantic cache over brand inputs - "Nike", "nike.com", and "@nike"
+# should hit one cached genome instead of re-running the whole pipeline.
+# Same redisvl cache the chat assistant uses; degrades to no caching.
+_genome_cache = None
+
+
+def _init_genome_cache():
+    global _genome_cache
+
+    try:
+        # redisvl 0.3.x path - see the matching import in brand_ai_assistant
+        from redisvl.extensions.llmcache import SemanticCache
+
+        _genome_cache = SemanticCache(
+            name="pixaro:genome",
+            redis_url=settings.redis_url,
+            distance_threshold=0.05,
+            ttl=86400
+        )
+        print("Genome semantic cache: enabled")
+    except Exception as e:
+        _genome_cache = None
+        print(f"Genome semantic cache unavailable: {e}")
+
+
+async def _genome_cache_lookup(brand_input: str) -> Optional[dict]:
+    """Return the cached genome result for a near-duplicate brand input"""
+    if _genome_cache is None:
+        return None
+
+    try:
+        hit = await asyncio.to_thread(
+            _genome_cache.check, prompt=brand_input.lower().strip()
+        )
+        if hit:
+            return orjson.loads(hit[0]["response"])
+    except Exception as e:
+        print(f"Warning: genome cache check failed: {e}")
+
+    return None
+
+
+async def _genome_cache_store(brand_input: str, result: dict):
+    """Remember a finished genome so near-duplicate inputs skip the pipeline"""
+    if _genome_cache is None:
+        return
+
+    try:
+        await asyncio.to_thread(
+            _genome_cache.store,
+            prompt=brand_input.lower().strip(),
+            response=orjson.dumps(result).decode()
+        )
+    except Exception as e:
+        print(f"Warning: genome cache store failed: {e}")
+
+
+async def _deliver_cached_report(job_id: str, brand_input: str, email: str, pdf_path: str):
+    """Email a cache-served report and record the outcome on the job"""
+    try:
+        from email_service import AsyncEmailService
+
+        email_service = _email if _email is not None else AsyncEmailService()
+        email_sent = await email_service.send_genome_report_email(
+            to_email=email,
+            brand_input=brand_input,
+            report_path=pdf_path
+        )
+
+        job = await _load_job(job_id)
+        if job is not None:
+            job['email_sent'] = email_sent
+            await _save_job(job)
+    except Exception as e:
+        print(f"[{job_id}] WARN - Failed to email cached report: {e}")
+
+
+def _setup_email_logging():
+    """
+    Route email and chat logs through a queue so request handlers and
+    SMTP worker threads never block on stdout; a single listener thread
+    does the actual writes.
+    """
+    import logging
+    import logging.handlers
+    import queue
+
+    log_queue = queue.Queue(-1)
+    handler = logging.StreamHandler()
+    handler.setFormatter(
+        logging.Formatter("%(asctime)s %(name)s %(levelname)s %(message)s")
+    )
+    listener = logging.handlers.QueueListener(log_queue, handler)
+    listener.start()
+
+    for name in ("email_service", "batch_sender", "chat"):
+        log = logging.getLogger(name)
+        log.addHandler(logging.handlers.QueueHandler(log_queue))
+        log.setLevel(logging.INFO)
+
+    return listener
+
+
 @app.on_event("startup")
 async def startup_event():
     """Initialize app"""
+    _setup_email_logging()
+    await _init_job_store()
+    _init_genome_cache()
+    _init_services()
+    _spawn(_report_store_sizes())
+    _spawn(_expire_chat_sessions())
     print("=" * 60)
     print("GENOME AI - Your Personal Marketing Strategist")
     print("=" * 60)
@@ -76,20 +529,37 @@ async def startup_event():
     print("")
 
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Release shared resources"""
+    await close_shared_client()
+
+
+# Page shells, read once at import - opening and reading the file per
+# request repeated blocking disk I/O inside the event loop for content
+# that never changes while the process runs
+def _read_page(filename: str) -> bytes:
+    with open(os.path.join(os.path.dirname(__file__), filename), "rb") as f:
+        return f.read()
+
+
+_CHAT_HTML = _read_page("chat_interface.html")
+_GENOME_HTML = _read_page("market_genome_page.html")
+
+# Let browsers cache the shells for a few minutes
+_PAGE_HEADERS = {"Cache-Control": "public, max-age=300"}
+
+
 @app.get("/", response_class=HTMLResponse)
 async def root():
     """Serve the Chat Interface (Default Homepage)"""
-    html_file = os.path.join(os.path.dirname(__file__), "chat_interface.html")
-    with open(html_file, "r", encoding="utf-8") as f:
-        return f.read()
+    return HTMLResponse(_CHAT_HTML, headers=_PAGE_HEADERS)
 
 
 @app.get("/genome", response_class=HTMLResponse)
 async def genome_page():
     """Serve the Market Genome Analysis Page"""
-    html_file = os.path.join(os.path.dirname(__file__), "market_genome_page.html")
-    with open(html_file, "r", encoding="utf-8") as f:
-        return f.read()
+    return HTMLResponse(_GENOME_HTML, headers=_PAGE_HEADERS)
 
 
 @app.get("/api")
@@ -132,86 +602,103 @@ async def analyze_brand_genome(
     5. Create PDF report
     6. Email to user
     """
+    job = await _load_job(job_id)
+    if job is None:
+        print(f"[{job_id}] ERROR - Job not found in store")
+        return
+
     try:
-        genome_jobs[job_id]['status'] = JobStatus.PROCESSING
-        genome_jobs[job_id]['message'] = 'Analyzing brand data...'
+        job['status'] = JobStatus.PROCESSING
+        job['message'] = 'Analyzing brand data...'
+        await _save_job(job)
 
         from market_genome_engine import MarketGenomeEngine
-        from email_service import EmailService
+        from email_service import AsyncEmailService
 
         print(f"\n[{job_id}] Starting Market Genome Analysis")
         print(f"[{job_id}] Brand: {brand_input}")
         print(f"[{job_id}] Type: {input_type}")
 
-        # Initialize engine
-        engine = MarketGenomeEngine()
-        email_service = EmailService()
+        # Use the shared pre-warmed services when available
+        engine = _engine if _engine is not None else MarketGenomeEngine()
+        email_service = _email if _email is not None else AsyncEmailService()
 
         # Step 1: Data Collection
         print(f"[{job_id}] Step 1: Collecting brand data...")
-        genome_jobs[job_id]['message'] = 'Collecting brand data from multiple sources...'
+        job['message'] = 'Collecting brand data from multiple sources...'
+        await _save_job(job)
 
-        brand_data = engine.collect_brand_data(
+        # Scraping is blocking I/O - run it in a thread so the event
+        # loop keeps serving other requests during the fetch
+        brand_data = await asyncio.to_thread(
+            engine.collect_brand_data,
             brand_input=brand_input,
             input_type=input_type
         )
 
-        # Step 2: AI Analysis
-        print(f"[{job_id}] Step 2: Analyzing brand DNA...")
-        genome_jobs[job_id]['message'] = 'Analyzing brand personality and positioning...'
-
-        brand_dna = engine.analyze_brand_dna(brand_data)
-
-        # Step 3: Competitor Analysis
-        print(f"[{job_id}] Step 3: Mapping competitors...")
-        genome_jobs[job_id]['message'] = 'Analyzing competitor landscape...'
+        # Steps 2-5: Fused AI Analysis - brand DNA, competitors, growth
+        # roadmap, and content strategy come back from a single
+        # structured call instead of four sequential round-trips
+        print(f"[{job_id}] Steps 2-5: Running fused genome analysis...")
+        job['message'] = 'Analyzing brand DNA, competitors, and strategy...'
+        await _save_job(job)
 
-        competitor_intel = engine.analyze_competitors(brand_data, brand_dna)
+        genome = await engine.analyze_full_genome(brand_data)
 
-        # Step 4: Growth Strategy
-        print(f"[{job_id}] Step 4: Creating growth roadmap...")
-        genome_jobs[job_id]['message'] = 'Generating growth strategy...'
+        brand_dna = genome['brand_dna']
+        competitor_intel = genome['competitors']
+        growth_roadmap = genome['growth_roadmap']
+        content_strategy = genome['content_strategy']
 
-        growth_roadmap = engine.create_growth_roadmap(brand_dna, competitor_intel)
+        # Step 6: Generate PDF Report
+        print(f"[{job_id}] Step 6: Generating PDF report...")
+        job['message'] = 'Creating Marketing Genome Report...'
+        await _save_job(job)
 
-        # Step 5: Content Strategy
-        print(f"[{job_id}] Step 5: Building content pillars...")
-        genome_jobs[job_id]['message'] = 'Creating content strategy...'
+        from market_genome_engine import _render_pdf
 
-        content_strategy = engine.create_content_strategy(brand_dna)
+        genome_data = {
+            'brand_dna': brand_dna,
+            'competitors': competitor_intel,
+            'growth_roadmap': growth_roadmap,
+            'content_strategy': content_strategy
+        }
 
-        # Step 6: Generate PDF Report
-        print(f"[{job_id}] Step 6: Generating PDF report...")
-        genome_jobs[job_id]['message'] = 'Creating Marketing Genome Report...'
-
-        pdf_path = engine.generate_genome_report(
-            job_id=job_id,
-            brand_name=brand_data['brand_name'],
-            brand_dna=brand_dna,
-            competitor_intel=competitor_intel,
-            growth_roadmap=growth_roadmap,
-            content_strategy=content_strategy
+        pdf_path = await asyncio.get_running_loop().run_in_executor(
+            _pdf_pool, _render_pdf, genome_data, brand_data['brand_name']
         )
 
-        genome_jobs[job_id]['pdf_path'] = pdf_path
-        genome_jobs[job_id]['pdf_url'] = f"/api/download/report/{job_id}"
+        job['pdf_path'] = pdf_path
+        job['pdf_url'] = f"/api/download/report/{job_id}"
 
         # Step 7: Send Email
         print(f"[{job_id}] Step 7: Sending report via email...")
-        genome_jobs[job_id]['message'] = 'Sending Marketing Genome Report...'
-
-        email_sent = email_service.send_genome_report_email(
-            to_email=email,
-            brand_input=brand_input,
-            report_path=pdf_path
-        )
-
-        genome_jobs[job_id]['email_sent'] = email_sent
+        job['message'] = 'Sending Marketing Genome Report...'
+        await _save_job(job)
+
+        # Coalesced requests may have added themselves to the
+        # notification list - everyone who asked gets the one report
+        recipients = dict.fromkeys([email, *job.get('notify_emails', ())])
+        email_sent = False
+        for recipient in recipients:
+            sent = await email_service.send_genome_report_email(
+                to_email=recipient,
+                brand_input=brand_input,
+                report_path=pdf_path
+            )
+            email_sent = email_sent or sent
+
+        job['email_sent'] = email_sent
 
         # Complete
-        genome_jobs[job_id]['status'] = JobStatus.COMPLETED
-        genome_jobs[job_id]['message'] = 'Marketing Genome Report generated successfully!'
-        genome_jobs[job_id]['completed_at'] = datetime.now().isoformat()
+        job['status'] = JobStatus.COMPLETED
+        job['message'] = 'Marketing Genome Report generated successfully!'
+        job['completed_at'] = time.time()
+        await _save_job(job)
+
+        # Future near-duplicate inputs ("Nike" vs "nike.com") can reuse
+        # this report without re-running the pipeline
+        await _genome_cache_store(brand_input, {'pdf_path': pdf_path})
 
         print(f"[{job_id}] SUCCESS - Complete! Report sent to {email}")
 
@@ -219,16 +706,26 @@ async def analyze_brand_genome(
         error_msg = f"Error generating genome: {str(e)}"
         print(f"[{job_id}] ERROR - {error_msg}")
 
-        genome_jobs[job_id]['status'] = JobStatus.FAILED
-        genome_jobs[job_id]['message'] = error_msg
+        job['status'] = JobStatus.FAILED
+        job['message'] = error_msg
+        await _save_job(job)
 
         # Send error email
         try:
-            email_service = EmailService()
-            email_service.send_error_email(email, brand_input, str(e))
+            from email_service import AsyncEmailService
+            email_service = _email if _email is not None else AsyncEmailService()
+            for recipient in dict.fromkeys([email, *job.get('notify_emails', ())]):
+                await email_service.send_error_email(recipient, brand_input, str(e))
         except:
             pass
 
+    finally:
+        # This brand's pipeline is no longer in flight; new report
+        # requests should start a fresh job
+        async with _inflight_reports_lock:
+            if _inflight_reports.get(brand_input.lower()) == job_id:
+                del _inflight_reports[brand_input.lower()]
+
 
 @app.post("/api/analyze")
 async def analyze_brand(
@@ -259,26 +756,55 @@ async def analyze_brand(
     # Generate job ID
     job_id = str(uuid.uuid4())
 
+    # Near-duplicate of an already-analyzed brand? Serve the cached
+    # report instead of paying for the whole pipeline again
+    cached = await _genome_cache_lookup(brand_input)
+    if cached and os.path.exists(cached.get('pdf_path', '')):
+        print(f"\nSUCCESS - Genome served from semantic cache: {job_id}")
+        print(f"   Brand: {brand_input}")
+
+        await _save_job({
+            'job_id': job_id,
+            'status': JobStatus.COMPLETED,
+            'message': 'Marketing Genome Report served from cache!',
+            'brand_input': brand_input,
+            'input_type': input_type,
+            'email': email,
+            'created_at': time.time(),
+            'completed_at': time.time(),
+            'pdf_path': cached['pdf_path'],
+            'pdf_url': f"/api/download/report/{job_id}",
+            'email_sent': False,
+            'from_cache': True
+        })
+        background_tasks.add_task(
+            _deliver_cached_report, job_id, brand_input, email, cached['pdf_path']
+        )
+
+        return {
+            "job_id": job_id,
+            "status": "completed",
+            "message": "Marketing Genome Report ready. It will be emailed shortly.",
+            "estimated_time": "under a minute"
+        }
+
     # Initialize job
-    genome_jobs[job_id] = {
+    await _save_job({
         'job_id': job_id,
         'status': JobStatus.PENDING,
         'message': 'Analysis starting...',
         'brand_input': brand_input,
         'input_type': input_type,
         'email': email,
-        'created_at': datetime.now().isoformat(),
+        'created_at': time.time(),
         'pdf_url': None,
         'email_sent': False
-    }
+    })
 
-    # Start background analysis
-    background_tasks.add_task(
-        analyze_brand_genome,
-        job_id,
-        brand_input,
-        input_type,
-        email
+    # Start background analysis - create_task schedules it on the loop
+    # immediately instead of tying it to this response's lifecycle
+    _spawn(
+        analyze_brand_genome(job_id, brand_input, input_type, email)
     )
 
     print(f"\nSUCCESS - Genome analysis started: {job_id}")
@@ -296,11 +822,10 @@ async def analyze_brand(
 async def get_genome_status(job_id: str):
     """Get analysis status"""
 
-    if job_id not in genome_jobs:
+    job = await _load_job(job_id)
+    if job is None:
         raise HTTPException(status_code=404, detail="Job not found")
 
-    job = genome_jobs[job_id]
-
     return {
         "job_id": job_id,
         "status": job['status'],
@@ -308,24 +833,25 @@ async def get_genome_status(job_id: str):
         "brand_input": job.get('brand_input'),
         "pdf_url": job.get('pdf_url'),
         "email_sent": job.get('email_sent', False),
-        "created_at": job.get('created_at'),
-        "completed_at": job.get('completed_at')
+        "created_at": _iso(job.get('created_at')),
+        "completed_at": _iso(job.get('completed_at'))
     }
 
 
 @app.get("/api/jobs")
 async def list_genome_jobs():
     """List all genome analysis jobs"""
+    jobs = await _all_jobs()
     return {
-        "total_jobs": len(genome_jobs),
+        "total_jobs": len(jobs),
         "jobs": [
             {
-                "job_id": job_id,
+                "job_id": job['job_id'],
                 "status": job['status'],
                 "brand": job.get('brand_input', ''),
-                "created_at": job.get('created_at')
+                "created_at": _iso(job.get('created_at'))
             }
-            for job_id, job in genome_jobs.items()
+            for job in jobs
         ]
     }
 
@@ -335,10 +861,11 @@ async def download_report(job_id: str):
     """Download Marketing Genome Report PDF"""
     from fastapi.responses import FileResponse
 
-    if job_id not in genome_jobs:
+    job = await _load_job(job_id)
+    if job is None:
         raise HTTPException(status_code=404, detail="Job not found")
 
-    pdf_path = genome_jobs[job_id].get('pdf_path')
+    pdf_path = job.get('pdf_path')
 
     if not pdf_path or not os.path.exists(pdf_path):
         raise HTTPException(status_code=404, detail="Report not found")
@@ -366,54 +893,56 @@ async def initialize_chat(request: ChatInitRequest):
     Returns:
         Session ID and welcome message
     """
-    from brand_ai_assistant import PixaroBrandAssistant
-
     try:
-        # Generate session ID
-        session_id = str(uuid.uuid4())
-
-        # Try to load existing brand context if available
-        brand_context = None
-
-        # Check if there's a recent genome analysis for this brand
-        for job_id, job in genome_jobs.items():
-            if (job.get('brand_input', '').lower() == request.brand_handle.lower() and
-                job.get('status') == JobStatus.COMPLETED):
-                # Load the brand context from previous analysis
-                # This gives the AI more context about the brand
-                brand_context = {
-                    'brand_dna': job.get('brand_dna', {}),
-                    'audience': job.get('audience', {}),
-                    'competitors': job.get('competitors', {})
-                }
-                break
-
-        # Initialize AI assistant
-        assistant = PixaroBrandAssistant(
-            brand_handle=request.brand_handle,
-            brand_context=brand_context
-        )
-
-        # Store session
-        chat_sessions[session_id] = {
-            'session_id': session_id,
-            'brand_handle': request.brand_handle,
-            'assistant': assistant,
-            'created_at': datetime.now().isoformat(),
-            'last_activity': datetime.now().isoformat()
-        }
-
-        welcome_message = f"""Hi! I'm your personal AI strategist for **{request.brand_handle}**.
-
-I can help you with:
-- Content creation (Instagram posts, captions, campaigns)
-- Audience insights and personas
-- Competitor analysis
-- Growth strategies
-- Engagement predictions
-- Weekly content planning
-
-What would you like to work on today?"""
+        brand_key = request.brand_handle.lower()
+
+        # Serialize concurrent inits for the same brand so a
+        # double-click or retry doesn't build two assistants in parallel
+        async with _brand_init_locks.setdefault(brand_key, asyncio.Lock()):
+            # A session created moments ago by the racing request is
+            # reused rather than duplicated
+            recent_id = _last_session_by_brand.get(brand_key)
+            if recent_id is not None:
+                if (recent := chat_sessions.get(recent_id)) is not None \
+                        and time.time() - recent.created_at < _INIT_REUSE_WINDOW:
+                    return {
+                        "session_id": recent_id,
+                        "brand_handle": recent.brand_handle,
+                        "welcome_message": _welcome_message(recent.brand_handle),
+                        # constructor coerces None to {}, so truthiness
+                        # (not an is-None check) matches the fresh path
+                        "has_context": bool(recent.assistant.brand_context)
+                    }
+
+            # Generate session ID
+            session_id = str(uuid.uuid4())
+
+            # Try to load existing brand context from this brand's
+            # most recent completed analysis - it gives the AI more
+            # context about the brand
+            brand_context = await _load_brand_context(brand_key)
+
+            # Initialize AI assistant
+            assistant = PixaroBrandAssistant(
+                brand_handle=request.brand_handle,
+                brand_context=brand_context
+            )
+
+            # Store session locally and mirror its metadata to Redis
+            # so other workers can pick it up
+            session = ChatSession(
+                session_id=session_id,
+                brand_handle=request.brand_handle,
+                assistant=assistant,
+                created_at=time.time(),
+                last_activity=time.time()
+            )
+            chat_sessions[session_id] = session
+            await _save_session_meta(session)
+            _last_session_by_brand[brand_key] = session_id
+            _mark_sessions_dirty()
+
+        welcome_message = _welcome_message(request.brand_handle)
 
         print(f"\nSUCCESS - Chat session started: {session_id}")
         print(f"   Brand: {request.brand_handle}")
@@ -443,21 +972,30 @@ async def send_chat_message(request: ChatMessageRequest):
         AI response with action type and metadata
     """
     try:
-        # Validate session
-        if request.session_id not in chat_sessions:
+        # Validate session - one lookup, bound in place
+        if (session := await _get_session(request.session_id)) is None:
             raise HTTPException(status_code=404, detail="Session not found. Please initialize chat first.")
 
-        session = chat_sessions[request.session_id]
-        assistant = session['assistant']
+        assistant = session.assistant
 
-        # Update last activity
-        session['last_activity'] = datetime.now().isoformat()
+        # Update last activity; re-inserting refreshes the local TTL so
+        # active sessions are never evicted mid-conversation, and the
+        # Redis mirror's expiry is pushed out alongside it
+        session.last_activity = time.time()
+        chat_sessions[request.session_id] = session
+        await _save_session_meta(session)
+        _mark_sessions_dirty()
 
         # Get AI response
-        response_data = assistant.chat(request.message)
+        response_data = await assistant.chat(request.message)
+        session.version += 1
 
-        print(f"\n[{request.session_id[:8]}] User: {request.message[:50]}...")
-        print(f"[{request.session_id[:8]}] AI: {response_data['response'][:50]}...")
+        # Lazy %-formatting: slicing and interpolation only happen if
+        # INFO is actually enabled, so the hot path pays nothing when
+        # chat logging is turned down in production
+        if _chat_log.isEnabledFor(logging.INFO):
+            _chat_log.info("[%s] User: %.50s...", request.session_id[:8], request.message)
+            _chat_log.info("[%s] AI: %.50s...", request.session_id[:8], response_data['response'])
 
         return {
             "session_id": request.session_id,
@@ -471,12 +1009,51 @@ async def send_chat_message(request: ChatMessageRequest):
     except HTTPException:
         raise
     except Exception as e:
-        print(f"ERROR - Chat message failed: {str(e)}")
+        _chat_log.error("Chat message failed: %s", e)
         raise HTTPException(status_code=500, detail=f"Chat error: {str(e)}")
 
 
+@app.post("/api/chat/stream")
+async def stream_chat_message(request: ChatMessageRequest):
+    """
+    Stream a chat response as Server-Sent Events.
+
+    Tokens are forwarded as they arrive from the model, so the client
+    sees the first words immediately instead of waiting for the full
+    completion.
+
+    Args:
+        session_id: Active chat session ID
+        message: User's message/question
+
+    Returns:
+        text/event-stream of token events, terminated by [DONE]
+    """
+    if (session := await _get_session(request.session_id)) is None:
+        raise HTTPException(status_code=404, detail="Session not found. Please initialize chat first.")
+
+    assistant = session.assistant
+
+    # Update last activity; re-inserting refreshes the TTL
+    session.last_activity = time.time()
+    chat_sessions[request.session_id] = session
+    await _save_session_meta(session)
+    _mark_sessions_dirty()
+
+    async def event_stream():
+        try:
+            async for token in assistant.chat_stream(request.message):
+                yield f"data: {orjson.dumps({'token': token}).decode()}\n\n"
+        except Exception as e:
+            yield f"data: {orjson.dumps({'error': str(e)}).decode()}\n\n"
+        session.version += 1
+        yield "data: [DONE]\n\n"
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
+
+
 @app.post("/api/chat/generate-report")
-async def generate_chat_report(request: ChatReportRequest, background_tasks: BackgroundTasks):
+async def generate_chat_report(request: ChatReportRequest):
     """
     Generate and email a comprehensive report based on chat conversation.
 
@@ -489,36 +1066,52 @@ async def generate_chat_report(request: ChatReportRequest, background_tasks: Bac
     """
     try:
         # Validate session
-        if request.session_id not in chat_sessions:
+        if (session := await _get_session(request.session_id)) is None:
             raise HTTPException(status_code=404, detail="Session not found")
 
-        session = chat_sessions[request.session_id]
-        brand_handle = session['brand_handle']
-
-        # Create a genome analysis job for this brand
-        job_id = str(uuid.uuid4())
-
-        genome_jobs[job_id] = {
-            'job_id': job_id,
-            'status': JobStatus.PENDING,
-            'message': 'Generating report from chat session...',
-            'brand_input': brand_handle,
-            'input_type': 'auto',
-            'email': request.email,
-            'created_at': datetime.now().isoformat(),
-            'pdf_url': None,
-            'email_sent': False,
-            'from_chat': True,
-            'chat_session_id': request.session_id
-        }
+        brand_handle = session.brand_handle
+        brand_key = brand_handle.lower()
+
+        async with _inflight_reports_lock:
+            # If this brand's report is already being generated, join
+            # that job rather than running the whole pipeline again
+            inflight_id = _inflight_reports.get(brand_key)
+            if inflight_id is not None:
+                inflight = await _load_job(inflight_id)
+                if inflight and inflight.get('status') in (JobStatus.PENDING, JobStatus.PROCESSING):
+                    notify = inflight.setdefault('notify_emails', [])
+                    if request.email != inflight.get('email') and request.email not in notify:
+                        notify.append(request.email)
+                        await _save_job(inflight)
+                    return {
+                        "success": True,
+                        "job_id": inflight_id,
+                        "message": f"A report for {brand_handle} is already in progress and will also be sent to {request.email}",
+                        "estimated_time": "3-5 minutes"
+                    }
+
+            # Create a genome analysis job for this brand
+            job_id = str(uuid.uuid4())
+
+            await _save_job({
+                'job_id': job_id,
+                'status': JobStatus.PENDING,
+                'message': 'Generating report from chat session...',
+                'brand_input': brand_handle,
+                'input_type': 'auto',
+                'email': request.email,
+                'notify_emails': [],
+                'created_at': time.time(),
+                'pdf_url': None,
+                'email_sent': False,
+                'from_chat': True,
+                'chat_session_id': request.session_id
+            })
+            _inflight_reports[brand_key] = job_id
 
         # Start background report generation
-        background_tasks.add_task(
-            analyze_brand_genome,
-            job_id,
-            brand_handle,
-            'auto',
-            request.email
+        _spawn(
+            analyze_brand_genome(job_id, brand_handle, 'auto', request.email)
         )
 
         print(f"\nSUCCESS - Chat report started: {job_id}")
@@ -540,65 +1133,88 @@ async def generate_chat_report(request: ChatReportRequest, background_tasks: Bac
 
 
 @app.get("/api/chat/history/{session_id}")
-async def get_chat_history(session_id: str):
-    """Get conversation history for a session."""
-    if session_id not in chat_sessions:
-        raise HTTPException(status_code=404, detail="Session not found")
+async def get_chat_history(session_id: str, request: Request):
+    """Get conversation history for a session.
 
-    session = chat_sessions[session_id]
-    assistant = session['assistant']
+    The session's turn counter doubles as a weak ETag: pollers that
+    already hold the current history get an empty 304 instead of the
+    full conversation being re-serialized and re-sent.
+    """
+    if (session := await _get_session(session_id)) is None:
+        raise HTTPException(status_code=404, detail="Session not found")
 
-    return {
-        "session_id": session_id,
-        "brand_handle": session['brand_handle'],
-        "conversation": assistant.get_conversation_history(),
-        "created_at": session['created_at'],
-        "last_activity": session['last_activity']
-    }
+    etag = f'W/"{session.version}"'
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
 
+    assistant = session.assistant
+    chat_sessions[session_id] = session
 
-@app.delete("/api/chat/session/{session_id}")
-async def end_chat_session(session_id: str):
-    """End a chat session and optionally export conversation."""
-    if session_id not in chat_sessions:
-        raise HTTPException(status_code=404, detail="Session not found")
+    return ORJSONResponse(
+        {
+            "session_id": session_id,
+            "brand_handle": session.brand_handle,
+            "conversation": assistant.get_conversation_history(),
+            "created_at": _iso(session.created_at),
+            "last_activity": _iso(session.last_activity)
+        },
+        headers={"ETag": etag}
+    )
 
-    session = chat_sessions[session_id]
-    assistant = session['assistant']
 
-    # Export conversation before deleting
+def _export_session(session_id: str, assistant):
+    """Write a session's transcript to disk; failures only get logged"""
     try:
         export_path = assistant.export_conversation()
         print(f"\nINFO - Chat session exported: {export_path}")
     except Exception as e:
-        print(f"WARN - Failed to export conversation: {str(e)}")
-        export_path = None
+        print(f"WARN - Failed to export conversation {session_id[:8]}: {e}")
 
-    # Remove session
-    del chat_sessions[session_id]
+
+@app.delete("/api/chat/session/{session_id}")
+async def end_chat_session(session_id: str, background_tasks: BackgroundTasks):
+    """End a chat session and export its conversation in the background."""
+    if (session := await _get_session(session_id)) is None:
+        raise HTTPException(status_code=404, detail="Session not found")
+
+    # The export is bookkeeping the caller never needs to wait on - the
+    # assistant reference keeps the conversation alive for the task, so
+    # the session itself can be dropped immediately and the response
+    # returns without paying for the transcript write
+    background_tasks.add_task(_export_session, session_id, session.assistant)
+
+    # Remove session locally and from the Redis mirror
+    chat_sessions.pop(session_id, None)
+    await _delete_session_meta(session_id)
+    _mark_sessions_dirty()
 
     return {
         "success": True,
-        "message": "Chat session ended",
-        "export_path": export_path
+        "message": "Chat session ended; conversation export scheduled"
     }
 
 
 @app.get("/api/chat/sessions")
 async def list_chat_sessions():
-    """List all active chat sessions."""
-    return {
-        "total_sessions": len(chat_sessions),
-        "sessions": [
-            {
-                "session_id": sid,
-                "brand_handle": session['brand_handle'],
-                "created_at": session['created_at'],
-                "last_activity": session['last_activity']
-            }
-            for sid, session in chat_sessions.items()
-        ]
-    }
+    """List all active chat sessions (cached until a session changes)."""
+    global _sessions_snapshot, _sessions_dirty
+
+    if _sessions_dirty or _sessions_snapshot is None:
+        _sessions_snapshot = {
+            "total_sessions": len(chat_sessions),
+            "sessions": [
+                {
+                    "session_id": sid,
+                    "brand_handle": session.brand_handle,
+                    "created_at": _iso(session.created_at),
+                    "last_activity": _iso(session.last_activity)
+                }
+                for sid, session in chat_sessions.items()
+            ]
+        }
+        _sessions_dirty = False
+
+    return _sessions_snapshot
 
 
 # ===================================================================
@@ -635,22 +1251,20 @@ async def schedule_content(
 
     try:
         # Validate session
-        if session_id not in chat_sessions:
+        if (session := await _get_session(session_id)) is None:
             raise HTTPException(status_code=404, detail="Session not found")
 
-        session = chat_sessions[session_id]
-        brand_handle = session['brand_handle']
+        brand_handle = session.brand_handle
 
         # Generate post ID
         post_id = str(uuid.uuid4())
 
         # If AI generation is requested and content is empty
         if ai_generate and not content_text:
-            from brand_ai_assistant import PixaroBrandAssistant
             assistant = PixaroBrandAssistant(brand_handle)
 
             # Generate caption using AI
-            ai_response = assistant.chat(f"Generate a {platform} post caption about our latest update. Make it engaging and professional.")
+            ai_response = await assistant.chat(f"Generate a {platform} post caption about our latest update. Make it engaging and professional.")
             content_text = ai_response.get('response', 'Check out our latest update!')
 
         # Add hashtags if provided
@@ -668,9 +1282,9 @@ async def schedule_content(
             'brand_handle': brand_handle,
             'platform': platform,
             'content': final_content,
-            'schedule_time': schedule_time or datetime.now().isoformat(),
+            'schedule_time': schedule_time or _iso(time.time()),
             'status': 'scheduled',
-            'created_at': datetime.now().isoformat(),
+            'created_at': _iso(time.time()),
             'has_image': image is not None
         }
 
@@ -725,11 +1339,9 @@ async def get_scheduled_posts(session_id: str):
 async def cancel_scheduled_post(post_id: str, session_id: str):
     """Cancel a scheduled post."""
 
-    if post_id not in scheduled_posts:
+    if (post := scheduled_posts.get(post_id)) is None:
         raise HTTPException(status_code=404, detail="Post not found")
 
-    post = scheduled_posts[post_id]
-
     if post['session_id'] != session_id:
         raise HTTPException(status_code=403, detail="Unauthorized")
 
@@ -1,9 +1,9 @@
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, ConfigDict, EmailStr
 from typing import Optional
-from enum import Enum
+from enum import StrEnum
 
 
-class JobStatus(str, Enum):
+class JobStatus(StrEnum):
     """Status of processing job"""
     PENDING = "pending"
     PROCESSING = "processing"
@@ -11,21 +11,30 @@ class JobStatus(str, Enum):
     FAILED = "failed"
 
 
-class ProductUploadRequest(BaseModel):
+class _ImmutableModel(BaseModel):
+    """
+    Base for request/response models. Frozen instances skip the
+    per-field mutability machinery and can be hashed/shared safely;
+    ignoring unknown fields avoids storing payload keys we never read.
+    """
+    model_config = ConfigDict(frozen=True, extra="ignore")
+
+
+class ProductUploadRequest(_ImmutableModel):
     """Request model for product upload"""
     product_name: str
     product_description: str
     email: EmailStr
 
 
-class ProductUploadResponse(BaseModel):
+class ProductUploadResponse(_ImmutableModel):
     """Response model for product upload"""
     job_id: str
     status: JobStatus
     message: str
 
 
-class JobStatusResponse(BaseModel):
+class JobStatusResponse(_ImmutableModel):
     """Response model for job status check"""
     job_id: str
     status: JobStatus
@@ -1,15 +1,22 @@
 """
-Simple startup script for Market Genome
-No reload, production mode
+Production startup script for Market Genome
+No reload; multiple workers sized to the machine
 """
+import os
+
 import uvicorn
 from config import settings
 
 if __name__ == "__main__":
+    # One worker per core unless WEB_CONCURRENCY says otherwise -
+    # reload is off, so uvicorn can fork a real worker pool
+    workers = int(os.getenv("WEB_CONCURRENCY", os.cpu_count() or 1))
+
     print("=" * 60)
     print("PIXARO MARKET GENOME")
     print("=" * 60)
     print(f"\nStarting server on http://127.0.0.1:{settings.api_port}")
+    print(f"Workers: {workers}")
     print(f"Open in browser: http://127.0.0.1:{settings.api_port}/")
     print(f"API docs: http://127.0.0.1:{settings.api_port}/docs")
     print("\nPress CTRL+C to stop\n")
@@ -20,5 +27,9 @@ if __name__ == "__main__":
         host="127.0.0.1",  # localhost only
         port=settings.api_port,
         reload=False,  # Disable reload for stability
+        workers=workers,
+        loop="uvloop",  # ships with uvicorn[standard]
+        http="httptools",
+        access_log=False,  # per-request log lines cost more than they tell
         log_level="info"
     )